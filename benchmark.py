@@ -0,0 +1,161 @@
+import argparse
+import json
+import os
+import random
+import sys
+from time import perf_counter_ns
+
+# Headless frame-time benchmark.
+# Runs the scene for N frames on SDL's dummy video driver with a fixed random
+# seed and simulated clicks, then prints per-entity update/draw percentiles
+# and total frame time (milliseconds) as JSON.
+#
+#     python benchmark.py --frames 600 --seed 1 > bench.json
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame  # noqa: E402  (after the SDL driver is chosen)
+from compositor import LayerCompositor  # noqa: E402
+from dirty_rects import DirtyRectRenderer  # noqa: E402
+from scene import WIDTH, HEIGHT, BLACK, Scene  # noqa: E402
+from sprite_cache import atlas  # noqa: E402
+from text_cache import text_cache  # noqa: E402
+from viewport import Viewport  # noqa: E402
+
+
+def percentiles(samples_ns):
+    # Nearest-rank p50/p95/p99 in milliseconds
+    if not samples_ns:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0}
+    ordered = sorted(samples_ns)
+    def rank(p):
+        index = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered))) - 1))
+        return ordered[index] / 1e6
+    return {
+        "p50": rank(50),
+        "p95": rank(95),
+        "p99": rank(99),
+        "mean": sum(ordered) / len(ordered) / 1e6,
+    }
+
+
+# Collects every per-group sample through the interface Scene.update and
+# Scene.draw time their groups with (see profiler.Profiler)
+class GroupTimer:
+    enabled = True
+
+    def __init__(self):
+        self.samples = {}  # "update <group>" / "draw <group>" -> [ns]
+
+    def start(self):
+        return perf_counter_ns()
+
+    def stop(self, name, start, category="phase"):
+        self.samples.setdefault(name, []).append(perf_counter_ns() - start)
+
+
+def run(frames=600, seed=0, click_every=30, dirty_rects=False, hearts=10, use_particles=True, render_scale=1.0,
+        compositor=False):
+    random.seed(seed)
+    # Clicks use their own generator so changing the click rate does not
+    # change where the hearts spawn
+    click_rng = random.Random(seed)
+    pygame.display.init()
+    pygame.font.init()
+    viewport = Viewport((WIDTH, HEIGHT), render_scale=render_scale)
+    screen = viewport.open()
+    display = pygame.display if viewport.direct else viewport
+    scene = Scene(heart_count=hearts, use_particles=use_particles)
+    renderer = DirtyRectRenderer(BLACK) if dirty_rects else None
+    compositor = LayerCompositor((WIDTH, HEIGHT), BLACK) if compositor else None
+
+    timer = GroupTimer()
+    events_ns = []
+    frame_ns = []
+    clicks = hits = 0
+    for frame in range(frames):
+        frame_start = perf_counter_ns()
+        entities = scene.entities
+        if compositor is not None and compositor.freeze(entities) and renderer is not None:
+            renderer.background = compositor.background
+            renderer.invalidate()
+        if renderer is not None:
+            renderer.clear(screen, entities)
+        elif compositor is not None:
+            compositor.clear(screen)
+        else:
+            screen.fill(BLACK)
+        scene.update(timer)
+        scene.draw(screen, 0.0, timer, compositor)
+
+        if click_every and frame % click_every == 0:
+            pos = (click_rng.randrange(WIDTH), click_rng.randrange(HEIGHT))
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+        start = perf_counter_ns()
+        for event in pygame.event.get():
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                clicks += 1
+                # The diary window needs a real display, so only the hit test runs
+                if scene.hit_test(viewport.to_logical(event.pos)):
+                    hits += 1
+        events_ns.append(perf_counter_ns() - start)
+
+        if renderer is not None:
+            renderer.present(entities, display)
+        else:
+            display.flip()
+        frame_ns.append(perf_counter_ns() - frame_start)
+    pygame.quit()
+
+    return {
+        "frames": frames,
+        "seed": seed,
+        "dirty_rects": dirty_rects,
+        "render_scale": render_scale,
+        "compositor": compositor is not None,
+        "hearts": hearts,
+        "particles": scene.small_hearts[0].__class__.__name__ == "HeartParticles" if hearts else False,
+        "clicks": clicks,
+        "click_hits": hits,
+        "entities": {
+            name: {phase: percentiles(timer.samples.get(f"{phase} {name}", [])) for phase in ("update", "draw")}
+            for name, _ in scene.groups
+        },
+        "events": percentiles(events_ns),
+        "frame": percentiles(frame_ns),
+        "sprite_atlas": atlas.stats(),
+        "text_cache": text_cache.stats(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless frame-time benchmark for the heart scene")
+    parser.add_argument("--frames", type=int, default=600, help="frames to simulate (default 600)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default 0)")
+    parser.add_argument("--click-every", type=int, default=30,
+                        help="simulate a left click every N frames, 0 to disable (default 30)")
+    parser.add_argument("--dirty-rects", action="store_true", help="use the dirty-rect renderer")
+    parser.add_argument("--hearts", type=int, default=10, help="floating hearts (default 10)")
+    parser.add_argument("--no-particles", action="store_true",
+                        help="use one SmallHeart object per heart instead of the NumPy particle system")
+    parser.add_argument("--render-scale", type=float, default=1.0,
+                        help="draw at this fraction of 800x600 and scale up (default 1)")
+    parser.add_argument("--compositor", action="store_true",
+                        help="keep entities that stopped changing in a cached background")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(args.frames, args.seed, args.click_every, args.dirty_rects, args.hearts, not args.no_particles,
+                 args.render_scale, args.compositor)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
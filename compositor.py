@@ -0,0 +1,97 @@
+import pygame
+
+from dirty_rects import as_rects, track
+
+# Layer compositor with frozen layers.
+# Entities whose drawing can no longer change report `frozen` (the love
+# letter once it is open, the note, the rose stem). Each frozen entity is
+# drawn once into its own cached layer, and all of them are flattened in draw
+# order into one background surface that replaces the clear fill. Per frame
+# only the live entities are drawn over it.
+#
+# Draw order is kept: where a live entity drew under a frozen one (a floating
+# heart passing behind the letter), that region is repainted at the end of the
+# frame with every entity in order, clipped to the region. Frames without such
+# an overlap pay nothing for it.
+
+
+class LayerCompositor:
+    def __init__(self, size, color):
+        self.size = size
+        self.color = color
+        self.background = None
+        self.frozen = None  # Frozen entities the background was built from
+        self.layers = {}  # frozen entity -> (cached layer, rect)
+        self.above = {}  # live entity -> rects of the frozen layers drawn after it
+        self.overlaps = {}  # frozen layer rect -> overlaps to repaint at the end of this frame
+        self.rebuilds = 0
+
+    def freeze(self, entities):
+        # Rebuild the background when the set of frozen entities changed;
+        # True when it did (everything on screen must be redrawn)
+        frozen = tuple(entity for entity in entities if entity.frozen)
+        if frozen == self.frozen:
+            return False
+        self.frozen = frozen
+        self.rebuilds += 1
+        background = pygame.Surface(self.size)
+        background.fill(self.color)
+        self.layers = {}
+        scratch = pygame.Surface(self.size, pygame.SRCALPHA)
+        for entity in frozen:
+            scratch.fill((0, 0, 0, 0))
+            rects = as_rects(entity.draw(scratch))
+            if rects:
+                rect = rects[0].unionall(rects[1:])
+                layer = scratch.subsurface(rect).copy()
+                background.blit(layer, rect)
+                self.layers[entity] = (layer, rect)
+        self.above = {}
+        for i, entity in enumerate(entities):
+            if entity not in self.layers:
+                self.above[entity] = [self.layers[e][1] for e in entities[i + 1:] if e in self.layers]
+        if pygame.display.get_surface() is not None:
+            background = background.convert()
+        self.background = background
+        return True
+
+    def clear(self, surface):
+        surface.blit(self.background, (0, 0))
+
+    def draw_layer(self, entity, surface, alpha=0.0):
+        # Scene.draw calls this for every entity in draw order, then repair()
+        if entity in self.layers:
+            return track(entity, None)  # Already in the background
+        rect = entity.draw(surface, alpha)
+        above = self.above.get(entity)
+        if above:
+            drawn = as_rects(rect)
+            for layer_rect in above:
+                hits = layer_rect.collidelistall(drawn)
+                if hits:
+                    self.overlaps.setdefault(tuple(layer_rect), []).extend(layer_rect.clip(drawn[i]) for i in hits)
+        return rect
+
+    def repair(self, surface, entities, alpha=0.0):
+        # Repaint where a live entity drew under a frozen one: clear the
+        # region and draw everything into it again, in order
+        if not self.overlaps:
+            return
+        clip = surface.get_clip()
+        # One region per frozen layer that was drawn under
+        for overlaps in self.overlaps.values():
+            region = overlaps[0].unionall(overlaps[1:])
+            surface.set_clip(region)
+            surface.fill(self.color, region)
+            for entity in entities:
+                if entity in self.layers:
+                    layer, rect = self.layers[entity]
+                    if rect.colliderect(region):
+                        surface.blit(layer, rect)
+                else:
+                    # Only pixels change; keep the rects the dirty-rect renderer tracks
+                    tracked = entity.rect, entity.prev_rect
+                    entity.draw(surface, alpha)
+                    entity.rect, entity.prev_rect = tracked
+        surface.set_clip(clip)
+        self.overlaps = {}
@@ -0,0 +1,252 @@
+import base64
+import io
+import math
+import time
+import pygame
+from diary_storage import DiaryStore
+from heart_geometry import heart_points
+
+# Tkinter diary window opened by clicking the heart or the love letter.
+# It is pumped from the pygame loop through pump(), so everything here runs
+# on that thread: animations are driven by after() callbacks, never sleeps.
+
+DIARY_SIZE = (420, 350)
+
+# Faded background hearts: (cx, cy, size, color)
+FADED_HEARTS = [
+    (60, 80, 2, "#f8bbd0"),
+    (350, 60, 1.5, "#f48fb1"),
+    (200, 300, 2.5, "#fce4ec"),
+    (320, 220, 1.2, "#f8bbd0"),
+    (120, 200, 1.7, "#f48fb1"),
+]
+
+# Add a flag to track if the diary page is open
+open_diary_page = False
+open_diary_win = None  # Track the diary window instance
+store = None  # Entry storage, opened at startup (see get_store)
+
+# The store opens the database on its writer thread; creating it at startup
+# gives that time to finish before the diary first needs it
+def get_store():
+    global store
+    if store is None:
+        store = DiaryStore()
+    return store
+
+# One line per recent entry for the diary window
+def recent_entries_text(limit=3):
+    lines = []
+    for _, created, entry in get_store().recent(limit):
+        snippet = " ".join(entry.split())
+        if len(snippet) > 40:
+            snippet = snippet[:39] + "…"
+        lines.append(f"{time.strftime('%d %b %H:%M', time.localtime(created))}  {snippet}")
+    return "\n".join(lines) if lines else "No entries yet"
+
+# Romantic background theme (gradient + faded hearts), rasterized once with
+# pygame and handed to Tk as a PNG
+def render_background():
+    width, height = DIARY_SIZE
+    background = pygame.Surface(DIARY_SIZE)
+    # Draw a vertical pink gradient
+    for i in range(0, height):
+        background.fill((255, 240 - i//2, 246), (0, i, width, 1))
+    # Tk's gray25 stipple: one pixel in four, offset on alternate rows
+    stipple = pygame.Surface(DIARY_SIZE, pygame.SRCALPHA)
+    row = pygame.Surface((width, 2), pygame.SRCALPHA)
+    for x in range(3, width, 4):
+        row.set_at((x, 0), (255, 255, 255, 255))
+        row.set_at((x - 2, 1), (255, 255, 255, 255))
+    for y in range(0, height, 2):
+        stipple.blit(row, (0, y))
+    # Draw faded hearts
+    for cx, cy, size, color in FADED_HEARTS:
+        layer = pygame.Surface(DIARY_SIZE, pygame.SRCALPHA)
+        pygame.draw.polygon(layer, pygame.Color(color), heart_points(cx, cy, size, resolution=45))  # Every 8 degrees
+        layer.blit(stipple, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        background.blit(layer, (0, 0))
+    data = io.BytesIO()
+    pygame.image.save(background, data, "background.png")
+    return base64.b64encode(data.getvalue())
+
+def background_image(tk, root):
+    # One PhotoImage per Tk root, reused every time the diary opens
+    if not hasattr(background_image, 'image'):
+        background_image.image = tk.PhotoImage(master=root, data=render_background())
+    return background_image.image
+
+# Grow from scale 1 to 20, then pulse 10 times; (points, delay in ms) per frame
+def heart_anim_frames():
+    for scale in range(1, 21):
+        yield heart_points(45, 45, scale * 2.2, resolution=180), 80  # Every 2 degrees
+    # Pulse
+    for _ in range(10):
+        for pulse in [1.0, 1.1, 1.0]:
+            yield heart_points(45, 45, pulse * 22, resolution=180, aspect=1 / 16), 120  # Narrow pulse heart
+
+def open_diary_entry_page():
+    import tkinter as tk
+    global open_diary_page, open_diary_win
+    open_diary_page = True
+    if not hasattr(open_diary_entry_page, 'root'):
+        open_diary_entry_page.root = tk.Tk()
+        open_diary_entry_page.root.withdraw()
+    diary_win = tk.Toplevel(open_diary_entry_page.root)
+    open_diary_win = diary_win
+    diary_win.title("Diary Entry")
+    diary_win.geometry("420x350")
+    diary_win.configure(bg="#fff0f6")
+    # Romantic background theme (gradient + faded hearts)
+    bg_canvas = tk.Canvas(diary_win, width=420, height=350, highlightthickness=0)
+    bg_canvas.place(x=0, y=0, relwidth=1, relheight=1)
+    bg_canvas.create_image(0, 0, anchor="nw", image=background_image(tk, open_diary_entry_page.root))
+    # Romantic border frame (above bg_canvas)
+    border = tk.Frame(diary_win, bg="#f8bbd0", bd=6, relief="ridge")
+    border.place(relx=0, rely=0, relwidth=1, relheight=1)
+    # Top frame for heart animation only (rose removed)
+    top_frame = tk.Frame(border, bg="#f8bbd0")
+    top_frame.pack(pady=(10, 0), fill=tk.X)
+    # Heart animation (centered at the top)
+    canvas = tk.Canvas(top_frame, width=90, height=90, bg="#fff0f6", highlightthickness=0)
+    canvas.pack(side=tk.TOP, pady=(0, 0), anchor="n")
+    # The polygon is created once; each frame only moves its points
+    frames = heart_anim_frames()
+    heart = canvas.create_polygon(0, 0, 0, 0, fill="#e75480", outline="#ad1457", width=2)
+    anim_after = None  # Pending after() id, cancelled when the window closes
+    def draw_heart_anim():
+        nonlocal anim_after
+        anim_after = None
+        frame = next(frames, None)
+        if frame is None:
+            return
+        points, delay = frame
+        canvas.coords(heart, *[c for point in points for c in point])
+        anim_after = canvas.after(delay, draw_heart_anim)
+    draw_heart_anim()
+    # Romantic Sayarii
+    sayarii = (
+        "\u2764\ufe0f\u2764\ufe0f\u2764\ufe0f\n"
+        "Every time I smile, believe me, you are the reason behind it...\n"
+        "\u2764\ufe0f\u2764\ufe0f\u2764\ufe0f"
+    )
+    sayarii_label = tk.Label(border, text=sayarii, font=("Arial", 14, "italic"), fg="#ad1457", bg="#fff0f6", justify="center")
+    sayarii_label.pack(pady=(10, 5))
+    # Beautiful English thoughts (quotes)
+    thoughts = [
+        "Love is not about how many days, months, or years you have been together. Love is about how much you love each other every single day.",
+        "You are the poem I never knew how to write, and this life is the story I have always wanted to tell.",
+        "In you, I have found the love of my life and my closest, truest friend.",
+        "Every moment spent with you is like a beautiful dream come true.",
+        "I look at you and see the rest of my life in front of my eyes."
+    ]
+    thoughts_text = '\u2764\ufe0f Beautiful Thoughts:\n' + '\n'.join(f'• {q}' for q in thoughts)
+    thoughts_label = tk.Label(border, text=thoughts_text, font=("Arial", 11, "italic"), fg="#6d4c41", bg="#fff0f6", justify="left", wraplength=380)
+    thoughts_label.pack(pady=(2, 2))
+    # Diary text area frame with rose image
+    text_frame = tk.Frame(border, bg="#fff0f6")
+    text_frame.pack(pady=10)
+    # Draw a rose image on the left of the text box using Canvas (vector art, not file)
+    rose_img_canvas = tk.Canvas(text_frame, width=60, height=60, bg="#fff0f6", highlightthickness=0)
+    rose_img_canvas.pack(side=tk.LEFT, padx=(0, 10))
+    def draw_static_rose():
+        cx, cy = 30, 35
+        # Stem (green)
+        rose_img_canvas.create_line(cx, cy, cx, cy+18, fill="#228B22", width=4, smooth=True)  # ForestGreen
+        # Leaves (green)
+        rose_img_canvas.create_oval(cx-14, cy+6, cx-2, cy+18, fill="#2E8B57", outline="")  # SeaGreen
+        rose_img_canvas.create_oval(cx+2, cy+6, cx+14, cy+18, fill="#2E8B57", outline="")
+        # Petals (red)
+        for i in range(5):
+            petal_angle = i * 72
+            rad = math.radians(petal_angle)
+            px = cx + 12 * math.cos(rad)
+            py = cy - 12 * math.sin(rad)
+            rose_img_canvas.create_oval(px-8, py-8, px+8, py+8, fill="#e53935", outline="#b71c1c", width=2)  # Red petals
+        # Center (dark red)
+        rose_img_canvas.create_oval(cx-7, cy-7, cx+7, cy+7, fill="#b71c1c", outline="#e53935", width=2)
+    draw_static_rose()
+    # Diary text area
+    text = tk.Text(text_frame, width=34, height=6, font=("Arial", 12), bg="#fff8fa", fg="#ad1457", bd=2, relief="groove")
+    text.pack(side=tk.LEFT)
+    # Most recent saved entries
+    recent_label = tk.Label(border, text=recent_entries_text(), font=("Arial", 9), fg="#6d4c41", bg="#fff0f6", justify="left")
+    recent_label.pack(pady=(0, 6))
+    # Save button: the entry is written in the background and the popup
+    # only appears once it is on disk
+    def save_entry():
+        entry = text.get("1.0", tk.END).strip()
+        save_btn.config(state=tk.DISABLED)
+        get_store().save(entry, on_saved=entry_saved)
+    def entry_saved(entry_id, error):
+        if not diary_win.winfo_exists():
+            return  # Closed while saving
+        save_btn.config(state=tk.NORMAL)
+        if error is not None:
+            # Nothing was written; the text stays in the box to try again.
+            # A plain window, not a modal dialog, so the animation keeps running
+            popup = tk.Toplevel(diary_win)
+            popup.title("Not saved")
+            popup.configure(bg="#fff0f6")
+            msg = tk.Label(popup, text=f"The diary entry could not be saved:\n{error}", font=("Arial", 11),
+                           fg="#ad1457", bg="#fff0f6", wraplength=260)
+            msg.pack(padx=10, pady=10)
+            ok_btn = tk.Button(popup, text="OK", command=popup.destroy, font=("Arial", 10, "bold"), bg="#d81b60", fg="white", bd=0, padx=10, pady=2)
+            ok_btn.pack(pady=(0, 10))
+            return
+        recent_label.config(text=recent_entries_text())
+        # Confirmation popup
+        popup = tk.Toplevel(diary_win)
+        popup.title("Saved!")
+        popup.geometry("200x80")
+        popup.configure(bg="#fff0f6")
+        msg = tk.Label(popup, text="Diary saved!", font=("Arial", 12), fg="#ad1457", bg="#fff0f6")
+        msg.pack(pady=10)
+        ok_btn = tk.Button(popup, text="OK", command=popup.destroy, font=("Arial", 10, "bold"), bg="#d81b60", fg="white", bd=0, padx=10, pady=2)
+        ok_btn.pack()
+        # Open new tab with animated rose background after save
+        def open_rose_animation_tab():
+            rose_win = tk.Toplevel(diary_win)
+            rose_win.title("Rose - Thank You")
+            rose_win.geometry("400x400")
+            rose_win.configure(bg="#fff0f6")
+            # Removed rose image section
+            note = tk.Label(rose_win, text="Thank youu!\nYou are special.", font=("Arial", 20, "bold italic"), fg="#d81b60", bg="#fff0f6", justify="center")
+            note.pack(pady=(120, 30))
+            rose_win.lift()
+            rose_win.focus_force()
+        # Open the rose animation tab after a short delay so user sees the confirmation
+        popup.after(600, open_rose_animation_tab)
+    save_btn = tk.Button(border, text="Save", command=save_entry, font=("Arial", 11, "bold"), bg="#43a047", fg="white", bd=0, padx=16, pady=4, relief="ridge")
+    save_btn.pack(pady=(0, 6))
+    # Close button
+    def close_diary():
+        global open_diary_page, open_diary_win
+        open_diary_page = False
+        open_diary_win = None
+        # destroy() drops the Tcl command a pending after() would call
+        if anim_after is not None:
+            canvas.after_cancel(anim_after)
+        diary_win.destroy()
+    close_btn = tk.Button(border, text="Close", command=close_diary, font=("Arial", 11, "bold"), bg="#d81b60", fg="white", bd=0, padx=16, pady=4, relief="ridge")
+    close_btn.pack(pady=(0, 10))
+    diary_win.protocol("WM_DELETE_WINDOW", close_diary)
+
+
+# Update Tkinter diary window if open
+def pump():
+    global open_diary_win
+    if store is not None:
+        store.poll()  # Finished saves
+    if open_diary_win is not None:
+        try:
+            open_diary_win.update()
+        except:
+            open_diary_win = None
+
+# Finish pending writes before the program exits
+def close():
+    global store
+    if store is not None:
+        store.close()
+        store = None
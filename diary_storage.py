@@ -0,0 +1,141 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+# Diary entry storage.
+# Entries are appended, timestamped, to a local SQLite file instead of
+# overwriting diary_entry.txt. Opening the database and all writes happen on
+# a background thread so a slow disk never stalls the Tk/pygame thread; the
+# writer commits queued entries in batches (one fsync per batch) and reports
+# completion back through poll(), which runs the callbacks on the caller's
+# thread. A batch that fails is reported as failed and the writer carries on.
+
+DB_PATH = "diary.db"
+LEGACY_PATH = "diary_entry.txt"  # Single entry written by older versions
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_created ON entries (created);
+"""
+
+
+class DiaryStore:
+    def __init__(self, path=DB_PATH, batch_size=32):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = queue.Queue()
+        self._completed = queue.Queue()
+        self._reader = None
+        self._error = None  # Why the database could not be opened
+        self._ready = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, name="diary-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        # WAL lets the reader run while the writer commits
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=FULL")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def _import_legacy(self, connection):
+        if not os.path.exists(LEGACY_PATH):
+            return
+        if connection.execute("SELECT 1 FROM entries LIMIT 1").fetchone():
+            return
+        with open(LEGACY_PATH, encoding="utf-8") as f:
+            text = f.read().strip()
+        if text:
+            with connection:
+                connection.execute("INSERT INTO entries (created, text) VALUES (?, ?)",
+                                   (os.path.getmtime(LEGACY_PATH), text))
+
+    def save(self, text, on_saved=None):
+        # Queue an entry; on_saved(entry_id, error) runs from poll() once it
+        # is on disk (error None) or could not be written (entry_id None)
+        self._pending.put((time.time(), text, on_saved))
+
+    def _open(self):
+        try:
+            connection = self._connect()
+            self._import_legacy(connection)
+            # Reads happen on the caller's thread with their own connection
+            self._reader = sqlite3.connect(self.path, check_same_thread=False)
+            return connection
+        except (sqlite3.Error, OSError) as error:
+            self._error = error
+            return None
+        finally:
+            self._ready.set()
+
+    def _write_loop(self):
+        connection = self._open()
+        while True:
+            item = self._pending.get()
+            if item is None:
+                break
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._pending.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            ids, error = [None] * len(batch), self._error
+            if connection is not None:
+                try:
+                    with connection:  # One commit for the whole batch
+                        ids = [
+                            connection.execute("INSERT INTO entries (created, text) VALUES (?, ?)",
+                                               (created, text)).lastrowid
+                            for created, text, _ in batch
+                        ]
+                except sqlite3.Error as failed:  # Disk full, locked, I/O error: rolled back
+                    error = failed
+            for (_, _, on_saved), entry_id in zip(batch, ids):
+                if on_saved is not None:
+                    self._completed.put((on_saved, entry_id, error))
+            if stop:
+                break
+        if connection is not None:
+            connection.close()
+
+    def poll(self):
+        # Run callbacks for finished writes; call from the UI thread
+        while True:
+            try:
+                on_saved, entry_id, error = self._completed.get_nowait()
+            except queue.Empty:
+                return
+            on_saved(entry_id, error)
+
+    def recent(self, limit=5):
+        # Newest first, as (id, created, text); empty if the database could
+        # not be opened. Only waits if called right after the store was created.
+        self._ready.wait()
+        if self._reader is None:
+            return []
+        return self._reader.execute(
+            "SELECT id, created, text FROM entries ORDER BY created DESC LIMIT ?", (limit,)
+        ).fetchall()
+
+    def close(self):
+        # Flush queued entries before exiting
+        if self._writer is not None:
+            self._pending.put(None)
+            self._writer.join()
+            self._writer = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
@@ -0,0 +1,59 @@
+import pygame
+
+# Opt-in dirty-rectangle rendering.
+# Every entity records the bounding rect of its last draw in `rect` and the
+# one before it in `prev_rect` (either may also be a list of rects). Instead of
+# filling and flipping the whole frame, only the regions entities covered last
+# frame are cleared, and only the old and new regions are pushed to the display.
+
+
+def track(entity, rect):
+    # Called at the end of an entity's draw with the rect it covered (or None)
+    entity.prev_rect = entity.rect
+    entity.rect = rect
+    return rect
+
+
+def as_rects(rect):
+    if rect is None:
+        return []
+    if isinstance(rect, list):
+        return [r for r in rect if r]
+    return [rect] if rect else []
+
+
+class DirtyRectRenderer:
+    def __init__(self, background, max_rects=256):
+        self.background = background  # Fill color, or a surface (the compositor's background)
+        # Past this many regions (e.g. thousands of particles) one full
+        # fill/flip is cheaper than many small ones
+        self.max_rects = max_rects
+        self.full_redraw = True  # The first frame is always pushed whole
+
+    def invalidate(self):
+        # e.g. after the window was exposed or resized
+        self.full_redraw = True
+
+    def clear(self, surface, entities):
+        rects = [] if self.full_redraw else [r for entity in entities for r in as_rects(entity.rect)]
+        if self.full_redraw or len(rects) > self.max_rects:
+            rects = [None]
+        for rect in rects:
+            if isinstance(self.background, pygame.Surface):
+                surface.blit(self.background, rect or (0, 0), area=rect)
+            else:
+                surface.fill(self.background, rect)
+
+    def present(self, entities, display=pygame.display):
+        # display: anything with flip() and update(rects), e.g. a Viewport
+        rects = []
+        if not self.full_redraw:
+            for entity in entities:
+                rects.extend(as_rects(entity.prev_rect))
+                rects.extend(as_rects(entity.rect))
+        if self.full_redraw or len(rects) > 2 * self.max_rects:
+            self.full_redraw = False
+            display.flip()
+            return []
+        display.update(rects)
+        return rects
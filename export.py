@@ -0,0 +1,107 @@
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+
+# Offline frame export.
+# Frame N shows the scene at t = N / fps, rebuilt from the random seed: a
+# worker seeds a fresh Scene, runs the simulation steps up to its first frame
+# without drawing, then renders its range of frames. Ranges are spread over
+# a multiprocessing pool and reassembled in order. The pool hands ranges out
+# in order, so a worker keeps its scene and continues it for its next range
+# instead of starting over: each worker simulates the timeline once. Output is a PNG sequence
+# or a raw RGB24 stream on stdout for piping into an encoder:
+#
+#     python export.py --duration 10 --fps 30 --format raw | \
+#         ffmpeg -f rawvideo -pix_fmt rgb24 -s 800x600 -r 30 -i - heart.mp4
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame  # noqa: E402  (after the SDL driver is chosen)
+from scene import WIDTH, HEIGHT, BLACK, SIM_RATE, Scene  # noqa: E402
+
+
+def steps_for_frame(frame, fps):
+    # Simulation steps run before frame N is drawn (frame 0 after one step,
+    # like the first frame of the live loop)
+    return int(frame * SIM_RATE / fps) + 1
+
+
+# Per worker process: [(seed, heart_count), scene, steps run]
+_worker = None
+
+
+def render_range(job):
+    # Runs in a worker: render frames [start, stop) and return them in order
+    global _worker
+    start, stop, fps, seed, heart_count, fmt, output = job
+    if not pygame.display.get_init():
+        pygame.display.init()
+        pygame.font.init()
+        pygame.display.set_mode((WIDTH, HEIGHT))
+    if _worker is None or _worker[0] != (seed, heart_count) or _worker[2] > steps_for_frame(start, fps):
+        # Nothing to continue (first range, or one from before it)
+        random.seed(seed)
+        _worker = [(seed, heart_count), Scene(heart_count=heart_count), 0]
+    _, scene, done_steps = _worker
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    frames = []
+    for frame in range(start, stop):
+        for _ in range(steps_for_frame(frame, fps) - done_steps):
+            scene.update()
+        done_steps = steps_for_frame(frame, fps)
+        surface.fill(BLACK)
+        scene.draw(surface)
+        if fmt == "png":
+            pygame.image.save(surface, os.path.join(output, f"frame_{frame:06d}.png"))
+            frames.append(None)
+        else:
+            frames.append(pygame.image.tobytes(surface, "RGB"))
+    _worker[2] = done_steps
+    return frames
+
+
+def export(frames, fps=30, seed=0, heart_count=10, fmt="png", output="frames", workers=None, chunk_size=30):
+    if fmt == "png":
+        os.makedirs(output, exist_ok=True)
+    jobs = [
+        (start, min(start + chunk_size, frames), fps, seed, heart_count, fmt, output)
+        for start in range(0, frames, chunk_size)
+    ]
+    stream = sys.stdout.buffer
+    with multiprocessing.Pool(workers) as pool:
+        # imap keeps chunk order, so frames are written in sequence
+        for chunk in pool.imap(render_range, jobs):
+            if fmt == "raw":
+                for data in chunk:
+                    stream.write(data)
+    if fmt == "raw":
+        stream.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the heart animation to a PNG sequence or raw RGB stream")
+    parser.add_argument("--fps", type=int, default=30, help="output frame rate (default 30)")
+    length = parser.add_mutually_exclusive_group()
+    length.add_argument("--frames", type=int, help="number of frames")
+    length.add_argument("--duration", type=float, default=10.0, help="length in seconds (default 10)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default 0)")
+    parser.add_argument("--hearts", type=int, default=10, help="floating hearts (default 10)")
+    parser.add_argument("--format", choices=["png", "raw"], default="png",
+                        help="png: numbered files in --output; raw: RGB24 frames on stdout")
+    parser.add_argument("--output", default="frames", help="directory for PNG frames (default frames)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=30, help="frames per work item (default 30)")
+    args = parser.parse_args(argv)
+
+    frames = args.frames if args.frames is not None else int(args.duration * args.fps)
+    if args.format == "raw" and sys.stdout.isatty():
+        parser.error("refusing to write raw video to a terminal; pipe it into an encoder")
+    export(frames, args.fps, args.seed, args.hearts, args.format, args.output, args.workers, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+
+import pygame
+
+# Persistent font-resolution cache.
+# pygame.font.SysFont scans every installed font (fc-list on Linux, the
+# registry on Windows) the first time it is called in a process, which
+# dominates startup. The file SysFont picks for each (name, bold, italic) is
+# saved on disk and loaded directly with pygame.font.Font on later runs. The
+# cache is dropped when any font directory changes.
+
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "animated-heart", "fonts.json")
+
+
+def font_dirs():
+    home = os.path.expanduser("~")
+    if sys.platform == "win32":
+        windir = os.environ.get("WINDIR", "C:\\Windows")
+        local = os.environ.get("LOCALAPPDATA", "")
+        return [os.path.join(windir, "Fonts"), os.path.join(local, "Microsoft", "Windows", "Fonts")]
+    if sys.platform == "darwin":
+        return ["/System/Library/Fonts", "/Library/Fonts", os.path.join(home, "Library", "Fonts")]
+    return ["/usr/share/fonts", "/usr/local/share/fonts", os.path.join(home, ".fonts"),
+            os.path.join(home, ".local", "share", "fonts")]
+
+
+def fingerprint():
+    # Modification times of every directory under the font roots (adding or
+    # removing a font file changes its directory's mtime, and on Debian/Ubuntu
+    # fonts sit two levels down, e.g. truetype/<family>/)
+    stamps = [pygame.version.ver]
+    for root in font_dirs():
+        for path, dirs, _ in os.walk(root):
+            dirs.sort()  # Same order every run
+            try:
+                stamps.append([path, os.stat(path).st_mtime_ns])
+            except OSError:
+                continue
+    return stamps
+
+
+class FontPathCache:
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._fingerprint = fingerprint()
+        self._entries = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("fingerprint") == self._fingerprint:
+                self._entries = data.get("fonts", {})
+        except (OSError, ValueError):
+            pass  # Missing or unreadable: start empty
+
+    def font(self, name, size, bold=False, italic=False):
+        key = f"{name}|{int(bold)}|{int(italic)}"
+        entry = self._entries.get(key)
+        if entry is not None:
+            fontpath, set_bold, set_italic = entry
+            if fontpath is None or os.path.exists(fontpath):
+                self.hits += 1
+                return self._construct(fontpath, size, set_bold, set_italic)
+        # Let SysFont search, and remember what it picked
+        self.misses += 1
+        picked = []
+        def constructor(fontpath, size, set_bold, set_italic):
+            picked.append([fontpath, set_bold, set_italic])
+            return self._construct(fontpath, size, set_bold, set_italic)
+        font = pygame.font.SysFont(name, size, bold=bold, italic=italic, constructor=constructor)
+        self._entries[key] = picked[0]
+        self.save()
+        return font
+
+    @staticmethod
+    def _construct(fontpath, size, set_bold, set_italic):
+        # Same as pygame's default SysFont constructor
+        font = pygame.font.Font(fontpath, size)
+        if set_bold:
+            font.set_bold(True)
+        if set_italic:
+            font.set_italic(True)
+        return font
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # Write then rename, so a restart mid-write never leaves a broken file
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"fingerprint": self._fingerprint, "fonts": self._entries}, f, indent=1)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass  # Read-only home: the cache is only an optimization
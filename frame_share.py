@@ -0,0 +1,176 @@
+import argparse
+import os
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+# Shared-memory frame output.
+# Each finished frame is copied straight from the surface's pixel buffer
+# (Surface.get_buffer, no intermediate bytes object) into one of two slots of
+# a multiprocessing.shared_memory block, so another local process can
+# composite the animation without any pipe or socket in between. The writer
+# always fills the slot that does not hold the latest frame.
+#
+# Layout (little-endian):
+#   header  magic "HRTF", version u16, slots u16, slot capacity u32, latest frame u64
+#   slot    sequence u64, frame u64, width u32, height u32, pitch u32, format 4s, pixels
+#
+# Readers never lock: a slot's sequence number is odd while it is being
+# written and is bumped again when done (a seqlock), so a reader checks it
+# before and after touching the pixels and retries if it changed.
+#
+#     python frame_share.py heart-frames   # print the rate frames arrive at
+
+MAGIC = b"HRTF"
+VERSION = 1
+SLOTS = 2
+HEADER = struct.Struct("<4sHHIQ")
+SLOT_HEADER = struct.Struct("<QQIII4s")
+HEADER_SIZE = 64  # Slots start cache-line aligned
+SLOT_HEADER_SIZE = 64
+
+
+def pixel_format(surface):
+    # Byte order of the pixels in memory, e.g. "BGRX" for a typical display surface
+    size = surface.get_bytesize()
+    if size not in (3, 4):
+        raise ValueError(f"unsupported pixel size {size}")
+    masks = dict(zip("RGBA", surface.get_masks()))
+    channels = ""
+    for byte in range(size):
+        shift = 8 * (byte if sys.byteorder == "little" else size - 1 - byte)
+        channels += next((name for name, mask in masks.items() if mask == 0xFF << shift), "X")
+    return channels.ljust(4)
+
+
+class FrameWriter:
+    def __init__(self, name, capacity):
+        # capacity: largest frame in bytes (pitch * height)
+        self.capacity = capacity
+        self.slot_size = SLOT_HEADER_SIZE + capacity
+        self.shm = shared_memory.SharedMemory(name, create=True, size=HEADER_SIZE + SLOTS * self.slot_size)
+        self.name = self.shm.name
+        self.frame = 0
+        buf = self.shm.buf
+        buf[:HEADER_SIZE + SLOTS * SLOT_HEADER_SIZE] = bytes(HEADER_SIZE + SLOTS * SLOT_HEADER_SIZE)
+        HEADER.pack_into(buf, 0, MAGIC, VERSION, SLOTS, capacity, 0)
+
+    def write(self, surface):
+        width, height = surface.get_size()
+        pitch = surface.get_pitch()
+        if pitch * height > self.capacity:
+            raise ValueError(f"{width}x{height} frame does not fit in {self.capacity} bytes")
+        self.frame += 1
+        buf = self.shm.buf
+        offset = HEADER_SIZE + (self.frame % SLOTS) * self.slot_size
+        sequence = SLOT_HEADER.unpack_from(buf, offset)[0]
+        # Odd sequence: readers know the slot is being rewritten
+        struct.pack_into("<Q", buf, offset, sequence + 1)
+        start = offset + SLOT_HEADER_SIZE
+        buf[start:start + pitch * height] = surface.get_buffer()
+        SLOT_HEADER.pack_into(buf, offset, sequence + 2, self.frame, width, height, pitch,
+                              pixel_format(surface).encode("ascii"))
+        # Published last, so it only ever names a complete slot
+        struct.pack_into("<Q", buf, HEADER.size - 8, self.frame)
+        return self.frame
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+class Frame:
+    def __init__(self, number, width, height, pitch, format, pixels, sequence):
+        self.number = number
+        self.width = width
+        self.height = height
+        self.pitch = pitch
+        self.format = format  # e.g. "BGRX", "RGB "
+        self.pixels = pixels  # memoryview into shared memory (or a copy)
+        self.sequence = sequence
+
+
+class FrameReader:
+    def __init__(self, name):
+        try:
+            self.shm = shared_memory.SharedMemory(name, track=False)  # Python 3.13+
+        except TypeError:
+            self.shm = shared_memory.SharedMemory(name)
+            # Older versions would unlink the writer's block when this process exits
+            if os.name == "posix":
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+        magic, version, slots, capacity, _ = HEADER.unpack_from(self.shm.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{name} is not a heart frame buffer")
+        self.slots = slots
+        self.slot_size = SLOT_HEADER_SIZE + capacity
+
+    def latest_number(self):
+        return struct.unpack_from("<Q", self.shm.buf, HEADER.size - 8)[0]
+
+    def latest(self):
+        # Zero-copy view of the newest frame, or None before the first one.
+        # The writer reuses the slot two frames later; check valid() after
+        # using the pixels, or use copy().
+        while True:
+            number = self.latest_number()
+            if not number:
+                return None
+            offset = HEADER_SIZE + (number % self.slots) * self.slot_size
+            sequence, frame, width, height, pitch, format = SLOT_HEADER.unpack_from(self.shm.buf, offset)
+            if sequence % 2 or frame != number:
+                continue  # Overtaken by the writer; look again
+            start = offset + SLOT_HEADER_SIZE
+            pixels = self.shm.buf[start:start + pitch * height]
+            return Frame(frame, width, height, pitch, format.decode("ascii"), pixels, sequence)
+
+    def valid(self, frame):
+        # True if the slot still holds frame (its pixels were not being rewritten)
+        offset = HEADER_SIZE + (frame.number % self.slots) * self.slot_size
+        return SLOT_HEADER.unpack_from(self.shm.buf, offset)[0] == frame.sequence
+
+    def copy(self):
+        # Newest frame with its pixels copied out, guaranteed untorn
+        while True:
+            frame = self.latest()
+            if frame is None:
+                return None
+            pixels = bytes(frame.pixels)
+            if self.valid(frame):
+                frame.pixels.release()
+                frame.pixels = pixels
+                return frame
+
+    def close(self):
+        self.shm.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch frames shared by the heart animation")
+    parser.add_argument("name", help="shared memory name given to --share-frames")
+    parser.add_argument("--seconds", type=float, default=0, help="stop after this long (default: run until Ctrl+C)")
+    args = parser.parse_args(argv)
+
+    reader = FrameReader(args.name)
+    started = window_start = time.perf_counter()
+    last = received = 0
+    try:
+        while not args.seconds or time.perf_counter() - started < args.seconds:
+            frame = reader.copy()
+            if frame is not None and frame.number != last:
+                last = frame.number
+                received += 1
+            now = time.perf_counter()
+            if now - window_start >= 1.0 and frame is not None:
+                print(f"frame {frame.number}  {frame.width}x{frame.height} {frame.format.strip()}  "
+                      f"{received / (now - window_start):.1f} fps")
+                window_start, received = now, 0
+            time.sleep(0.002)
+    except KeyboardInterrupt:
+        pass
+    reader.close()
+
+
+if __name__ == "__main__":
+    main()
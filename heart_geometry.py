@@ -0,0 +1,38 @@
+import math
+from functools import lru_cache
+
+# Shared heart curve geometry used by every heart renderer.
+# The parametric curve is evaluated once per resolution; scaled copies are
+# kept in an LRU cache so moving hearts only pay for the translation.
+
+DEFAULT_RESOLUTION = 360  # Samples around the curve (1 per degree)
+SHAPE_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=None)
+def unit_heart(resolution=DEFAULT_RESOLUTION):
+    # Heart curve at size 1, centred on (0, 0)
+    points = []
+    for i in range(resolution):
+        t = 2 * math.pi * i / resolution
+        x = 16 * math.sin(t) ** 3
+        y = -(13 * math.cos(t) - 5 * math.cos(2 * t)
+              - 2 * math.cos(3 * t) - math.cos(4 * t))
+        points.append((x, y))
+    return tuple(points)
+
+
+@lru_cache(maxsize=SHAPE_CACHE_SIZE)
+def heart_shape(size, resolution=DEFAULT_RESOLUTION, aspect=1.0):
+    # Scaled curve, still centred on (0, 0); aspect stretches it horizontally
+    x_size = size * aspect
+    return tuple((x_size * x, size * y) for x, y in unit_heart(resolution))
+
+
+def heart_points(x, y, size, resolution=DEFAULT_RESOLUTION, count=None, aspect=1.0, start=0):
+    # Scaled and translated points; start/count limit the result to samples
+    # start..count-1 (used for the partially drawn outline)
+    shape = heart_shape(size, resolution, aspect)
+    if start or count is not None:
+        shape = shape[start:count]
+    return [(x + px, y + py) for px, py in shape]
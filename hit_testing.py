@@ -0,0 +1,82 @@
+import weakref
+
+import pygame
+
+# Click and hover picking.
+# Every clickable entity registers the rect it covers in a uniform grid, so
+# finding what is under the mouse looks at a single cell however many
+# floating hearts there are. Candidates are then tested pixel-exactly against
+# a pygame.mask of the sprite they draw (the cached heart keyframe, the letter
+# frame, the small heart sprite); masks are built once per cached sprite.
+
+DEFAULT_CELL_SIZE = 64
+
+_masks = weakref.WeakKeyDictionary()  # sprite -> mask, dropped with the sprite
+
+
+def sprite_mask(sprite):
+    mask = _masks.get(sprite)
+    if mask is None:
+        # Default threshold: the faint glow around small hearts is not solid
+        mask = _masks[sprite] = pygame.mask.from_surface(sprite)
+    return mask
+
+
+def sprite_hit(sprite, left, top, pos):
+    # pos is inside the opaque part of sprite drawn at (left, top)
+    x, y = int(pos[0] - left), int(pos[1] - top)
+    width, height = sprite.get_size()
+    return 0 <= x < width and 0 <= y < height and bool(sprite_mask(sprite).get_at((x, y)))
+
+
+class SpatialGrid:
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> set of keys
+        self.spans = {}  # key -> (first column, first row, last column, last row)
+
+    def span(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def place(self, key, rect):
+        # Insert or move; rect None (or empty) removes the key
+        if not rect:
+            self.remove(key)
+        else:
+            self.place_span(key, self.span(rect))
+
+    def place_span(self, key, span):
+        old = self.spans.get(key)
+        if old == span:
+            return  # Still in the same cells: most moves end here
+        if old is not None:
+            self._unlink(key, old)
+        x0, y0, x1, y1 = span
+        for column in range(x0, x1 + 1):
+            for row in range(y0, y1 + 1):
+                self.cells.setdefault((column, row), set()).add(key)
+        self.spans[key] = span
+
+    def remove(self, key):
+        old = self.spans.pop(key, None)
+        if old is not None:
+            self._unlink(key, old)
+
+    def _unlink(self, key, span):
+        x0, y0, x1, y1 = span
+        for column in range(x0, x1 + 1):
+            for row in range(y0, y1 + 1):
+                cell = self.cells[(column, row)]
+                cell.discard(key)
+                if not cell:
+                    del self.cells[(column, row)]
+
+    def at(self, pos):
+        # Keys whose rect may contain pos
+        size = self.cell_size
+        return self.cells.get((int(pos[0]) // size, int(pos[1]) // size), ())
+
+    def __len__(self):
+        return len(self.spans)
@@ -0,0 +1,80 @@
+import time
+
+import pygame
+
+# Idle- and focus-aware frame pacing.
+# The scene only needs the full frame rate while a one-shot animation is
+# running (outline, growth, letter, text fade), while the user is
+# interacting, or while the diary window needs pumping. Otherwise only slow
+# ambient motion is left and the render rate drops; when the window is
+# unfocused it drops further, and when it is minimized or hidden the loop
+# blocks on pygame.event.wait until something happens.
+#
+# Because animation runs on the fixed-step scheduler, changing the render
+# rate never changes animation speed.
+
+INPUT_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION,
+                pygame.MOUSEWHEEL, pygame.KEYDOWN, pygame.KEYUP)
+
+
+class FramePacer:
+    def __init__(self, active_fps=60, settled_fps=30, unfocused_fps=10, hidden_wait_ms=1000, input_boost_ms=2000):
+        self.active_fps = active_fps
+        self.settled_fps = settled_fps
+        self.unfocused_fps = unfocused_fps
+        self.hidden_wait_ms = hidden_wait_ms  # Wake up this often while hidden
+        self.input_boost_ms = input_boost_ms  # Full rate for this long after input
+        self.focused = True
+        self.hidden = False
+        self.last_input = time.perf_counter()
+        self.mode = "active"
+
+    def handle_event(self, event):
+        if event.type == pygame.WINDOWFOCUSLOST:
+            self.focused = False
+        elif event.type == pygame.WINDOWFOCUSGAINED:
+            self.focused = True
+        elif event.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+            self.hidden = True
+        elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN, pygame.WINDOWMAXIMIZED):
+            self.hidden = False
+        elif event.type == pygame.ACTIVEEVENT:
+            # Legacy focus events: state 2 is input focus, 4 is the app being visible
+            if event.state & 2:
+                self.focused = bool(event.gain)
+            if event.state & 4:
+                self.hidden = not event.gain
+        if event.type in INPUT_EVENTS:
+            self.wake()
+
+    def wake(self):
+        # Back to full rate, e.g. on input or when the diary opens
+        self.last_input = time.perf_counter()
+        self.hidden = False
+
+    def should_block(self, busy=False):
+        return self.hidden and not busy
+
+    def wait(self):
+        # Block until an event arrives (or hidden_wait_ms passes); the event
+        # is put back so the main loop still sees it
+        event = pygame.event.wait(self.hidden_wait_ms)
+        if event.type != pygame.NOEVENT:
+            pygame.event.post(event)
+
+    def fps(self, settled, busy=False):
+        # settled: only ambient motion is left in the scene
+        # busy: something outside the scene needs regular pumping (the diary)
+        recent_input = (time.perf_counter() - self.last_input) * 1000 < self.input_boost_ms
+        if busy or recent_input:
+            self.mode = "active"
+            return self.active_fps
+        if self.hidden:
+            self.mode = "hidden"
+            return self.unfocused_fps
+        if not settled:
+            # Keep one-shot animations smooth, a bit less so in the background
+            self.mode = "active" if self.focused else "unfocused"
+            return self.active_fps if self.focused else self.settled_fps
+        self.mode = "settled" if self.focused else "unfocused"
+        return self.settled_fps if self.focused else self.unfocused_fps
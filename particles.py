@@ -0,0 +1,135 @@
+import random
+
+import numpy as np
+import pygame
+
+from dirty_rects import track
+from hit_testing import sprite_hit
+from sprite_cache import atlas
+
+# Struct-of-arrays version of the floating SmallHearts.
+# Position, size, speed, blink timer and visibility live in NumPy arrays, so
+# moving, blinking and respawning thousands of hearts is a handful of vector
+# operations, and drawing is one Surface.blits call with cached sprites.
+
+
+class HeartParticles:
+    settled = True  # Ambient motion only, like SmallHeart
+    frozen = False
+
+    def __init__(self, count, width, height, render_sprite, exclusion=None, rng=None):
+        self.count = count
+        self.width = width
+        self.height = height
+        self.render_sprite = render_sprite  # size -> (surface, offset), see SmallHeart
+        self.exclusion = exclusion  # pygame.Rect new hearts avoid (tried up to 21 times)
+        # Seed from `random` so random.seed() keeps the scene reproducible
+        self.rng = rng if rng is not None else np.random.default_rng(random.getrandbits(64))
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.size = np.zeros(count)
+        self.speed = np.zeros(count)
+        self.blink_timer = np.zeros(count, dtype=np.int32)
+        self.visible = np.zeros(count, dtype=bool)
+        self.rect = None
+        self.prev_rect = None
+        self.grid_spans = None  # Grid cells each heart was last placed in
+        self.reset(np.arange(count))
+
+    def reset(self, index):
+        n = len(index)
+        x = self.rng.integers(0, self.width + 1, n).astype(float)
+        y = (self.height + self.rng.integers(0, 101, n)).astype(float)
+        if self.exclusion is not None:
+            # Avoid placing small hearts too close to the main heart
+            zone = self.exclusion
+            for _ in range(21):
+                inside = (x >= zone.left) & (x < zone.right) & (y >= zone.top) & (y < zone.bottom)
+                retry = np.flatnonzero(inside)
+                if not len(retry):
+                    break
+                x[retry] = self.rng.integers(0, self.width + 1, len(retry))
+                y[retry] = self.height + self.rng.integers(0, 101, len(retry))
+        self.x[index] = x
+        self.y[index] = y
+        self.size[index] = self.rng.uniform(0.3, 0.5, n)
+        self.speed[index] = self.rng.uniform(0.3, 0.7, n)  # Slower floating
+        self.blink_timer[index] = self.rng.integers(20, 51, n)  # Slower blink
+        self.visible[index] = self.rng.random(n) < 0.5
+
+    def update(self):
+        self.y -= self.speed
+        self.blink_timer -= 1
+        blink = np.flatnonzero(self.blink_timer <= 0)
+        if len(blink):
+            self.visible[blink] = ~self.visible[blink]
+            self.blink_timer[blink] = self.rng.integers(20, 51, len(blink))
+        gone = np.flatnonzero(self.y < -50)
+        if len(gone):
+            self.reset(gone)
+
+    def sprites(self, index):
+        # Distinct sprites for the given hearts, their offsets, and which
+        # sprite each heart uses. Same quantization as SmallHeart, so both
+        # share atlas sprites.
+        step = atlas.size_step
+        sizes = np.round(np.round(self.size[index] / step) * step, 6)
+        keys, which = np.unique(sizes, return_inverse=True)
+        sprites = []
+        offsets = np.zeros((len(keys), 2))
+        for k, size in enumerate(keys.tolist()):
+            sprite, offsets[k] = atlas.get(("small_heart", size), lambda: self.render_sprite(size))
+            sprites.append(sprite)
+        return sprites, offsets, which
+
+    def draw(self, surface, alpha=0.0):
+        index = np.flatnonzero(self.visible)
+        if not len(index):
+            return track(self, None)
+        sprites, offsets, which = self.sprites(index)
+        xs = (self.x[index] + offsets[which, 0]).astype(int)
+        ys = (self.y[index] - self.speed[index] * alpha + offsets[which, 1]).astype(int)
+        clip = surface.get_clip()
+        if clip != surface.get_rect():
+            # Clipped (the compositor repainting a region): skip the hearts outside
+            sizes = np.array([sprite.get_size() for sprite in sprites])
+            inside = np.flatnonzero((xs < clip.right) & (xs + sizes[which, 0] > clip.left)
+                                    & (ys < clip.bottom) & (ys + sizes[which, 1] > clip.top))
+            which, xs, ys = which[inside], xs[inside], ys[inside]
+        xs, ys = xs.tolist(), ys.tolist()
+        rects = surface.blits([
+            (sprites[k], (x, y), None, pygame.BLEND_RGBA_ADD)
+            for k, x, y in zip(which.tolist(), xs, ys)
+        ])
+        # One rect per heart, so the dirty-rect renderer only touches the hearts
+        return track(self, rects)
+
+    # Clickable: every heart is a grid entry keyed by (self, index)
+    def place(self, grid):
+        # Only hearts that crossed into other cells since the last call are moved
+        if not self.count:
+            return
+        sprites, offsets, which = self.sprites(np.arange(self.count))
+        sizes = np.array([sprite.get_size() for sprite in sprites])
+        left = (self.x + offsets[which, 0]).astype(int)
+        top = (self.y + offsets[which, 1]).astype(int)
+        cell = grid.cell_size
+        spans = np.stack([left // cell, top // cell,
+                          (left + sizes[which, 0] - 1) // cell, (top + sizes[which, 1] - 1) // cell], axis=1)
+        if self.grid_spans is None:
+            moved = np.arange(self.count)
+        else:
+            moved = np.flatnonzero((spans != self.grid_spans).any(axis=1))
+        for i, span in zip(moved.tolist(), spans[moved].tolist()):
+            grid.place_span((self, i), tuple(span))
+        self.grid_spans = spans
+
+    def hit(self, index, pos):
+        if not self.visible[index]:
+            return False
+        size = atlas.quantize_size(self.size[index])
+        sprite, (ox, oy) = atlas.get(("small_heart", size), lambda: self.render_sprite(size))
+        return sprite_hit(sprite, int(self.x[index] + ox), int(self.y[index] + oy), pos)
+
+    def pop(self, index):
+        self.reset(np.array([index]))
@@ -0,0 +1,139 @@
+import json
+import os
+import sys
+from collections import deque
+from time import perf_counter_ns
+
+import pygame
+
+from dirty_rects import track
+from text_cache import fonts
+
+# Hot-path instrumentation for the main loop.
+# Phases of the loop and each entity group's update/draw are timed with
+# perf_counter_ns into a ring buffer. The on-screen HUD shows FPS, a frame
+# time graph and the most expensive spans, and the buffer can be dumped as a
+# Chrome trace (chrome://tracing or ui.perfetto.dev).
+#
+# While disabled, start() returns 0 and stop() returns after one attribute
+# check, and the scene skips its per-group timing entirely.
+
+GRAPH_MS = 33.3  # Frame time at the top of the graph
+
+
+class Profiler:
+    def __init__(self, enabled=False, capacity=20000, history=240, hud_interval_ms=250):
+        self.enabled = enabled
+        self.events = deque(maxlen=capacity)  # (name, category, start_ns, duration_ns)
+        self.frame_times = deque(maxlen=history)  # ms
+        self.costs = {}  # name -> smoothed duration in ms
+        self.hud_interval_ms = hud_interval_ms
+        self.last_frame = None
+        self.hud = None
+        self.hud_built = 0
+        self.rect = None
+        self.prev_rect = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.last_frame = None
+        self.hud = None
+
+    def start(self):
+        return perf_counter_ns() if self.enabled else 0
+
+    def stop(self, name, start, category="phase"):
+        if not self.enabled:
+            return
+        duration = perf_counter_ns() - start
+        self.events.append((name, category, start, duration))
+        ms = duration / 1e6
+        self.costs[name] = self.costs.get(name, ms) * 0.9 + ms * 0.1
+
+    def end_frame(self):
+        # Call once per loop iteration; frame time includes the wait
+        if not self.enabled:
+            return
+        now = perf_counter_ns()
+        if self.last_frame is not None:
+            self.frame_times.append((now - self.last_frame) / 1e6)
+            self.events.append(("frame", "frame", self.last_frame, now - self.last_frame))
+        self.last_frame = now
+
+    def draw(self, surface, alpha=0.0):
+        if not self.enabled:
+            return track(self, None)
+        now = pygame.time.get_ticks()
+        if self.hud is None or now - self.hud_built >= self.hud_interval_ms:
+            self.hud = self.render_hud()
+            self.hud_built = now
+        return track(self, surface.blit(self.hud, (8, 8)))
+
+    def render_hud(self):
+        font = fonts.get("Consolas", 14)
+        lines = []
+        if self.frame_times:
+            recent = list(self.frame_times)[-30:]
+            average = sum(recent) / len(recent)
+            lines.append(f"FPS {1000 / average:5.1f}   frame {average:5.2f} ms   max {max(self.frame_times):5.2f} ms")
+        else:
+            lines.append("FPS   --")
+        top = sorted(self.costs.items(), key=lambda item: item[1], reverse=True)[:8]
+        lines.extend(f"{ms:6.3f} ms  {name}" for name, ms in top)
+        line_height = font.get_linesize()
+        graph_height = 40
+        width, height = 300, 8 + graph_height + 6 + line_height * len(lines) + 6
+        hud = pygame.Surface((width, height), pygame.SRCALPHA)
+        hud.fill((0, 0, 0, 170))
+        # Frame time graph, newest on the right
+        graph_top = 8
+        pygame.draw.line(hud, (90, 90, 90), (6, graph_top), (width - 6, graph_top))
+        samples = list(self.frame_times)
+        step = (width - 12) / max(1, self.frame_times.maxlen - 1)
+        points = [
+            (6 + (i + self.frame_times.maxlen - len(samples)) * step,
+             graph_top + graph_height - min(ms, GRAPH_MS) / GRAPH_MS * graph_height)
+            for i, ms in enumerate(samples)
+        ]
+        if len(points) > 1:
+            pygame.draw.lines(hud, (120, 255, 120), False, points)
+        y = graph_top + graph_height + 6
+        for line in lines:
+            hud.blit(font.render(line, True, (255, 255, 255)), (6, y))
+            y += line_height
+        return hud
+
+    def dump_chrome_trace(self, path):
+        # Complete ("X") events in microseconds, one process, one thread
+        pid = os.getpid()
+        trace = {
+            "traceEvents": [
+                {"name": name, "cat": category, "ph": "X", "ts": start / 1000, "dur": duration / 1000,
+                 "pid": pid, "tid": 0}
+                for name, category, start, duration in self.events
+            ],
+            "displayTimeUnit": "ms",
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f)
+        return len(trace["traceEvents"])
+
+
+# Time to first frame, split into named phases
+class StartupTimer:
+    def __init__(self):
+        self.start = self.last = perf_counter_ns()
+        self.phases = []  # (name, ms)
+
+    def mark(self, name):
+        now = perf_counter_ns()
+        self.phases.append((name, (now - self.last) / 1e6))
+        self.last = now
+
+    def total_ms(self):
+        return (self.last - self.start) / 1e6
+
+    def report(self, file=sys.stderr):
+        for name, ms in self.phases:
+            print(f"{ms:8.1f} ms  {name}", file=file)
+        print(f"{self.total_ms():8.1f} ms  total to first frame", file=file)
@@ -0,0 +1,665 @@
+import pygame
+import random
+import math
+from dirty_rects import track
+from heart_geometry import heart_points
+from hit_testing import SpatialGrid, sprite_hit
+from sprite_cache import SpriteAtlas, atlas
+from text_cache import fonts, render_text
+
+try:
+    from particles import HeartParticles
+except ImportError:  # NumPy not installed: fall back to SmallHeart objects
+    HeartParticles = None
+
+# The animated scene: every entity plus the Scene that owns them.
+# Importing this module has no side effects; pygame (display and font) must be
+# initialised before a Scene is created.
+
+# Screen setup
+WIDTH, HEIGHT = 800, 600
+
+# Colors
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+PINK = (255, 105, 180)
+WHITE = (255, 255, 255)
+
+FROM_TEXT = "From your Shreyash❤️😁"
+
+# Entity speeds (heart rise, outline progress, letter opening, rose turn) are
+# defined per step, so the simulation always steps at this rate
+SIM_RATE = 60
+
+# Simulation time in ms, advanced by Scene.update. Time-based effects (the
+# pulse and the text wave) read it instead of the wall clock, so a scene is
+# fully determined by its random seed and the number of steps run.
+class SimClock:
+    def __init__(self):
+        self.step_ms = 1000.0 / SIM_RATE
+        self.ticks = 0.0
+
+    def advance(self):
+        self.ticks += self.step_ms
+
+def draw_heart(surface, x, y, size, color, border=False):
+    points = heart_points(x, y, size)
+    rect = pygame.draw.polygon(surface, color, points)
+    if border:
+        rect.union_ip(pygame.draw.polygon(surface, PINK, points, width=2))
+    return rect
+
+# Small glowing heart
+class SmallHeart:
+    settled = True  # Ambient motion only: never asks for the full frame rate
+    frozen = False
+
+    def __init__(self):
+        self.rect = None
+        self.prev_rect = None
+        self.reset()
+
+    def reset(self):
+        # Avoid placing small hearts too close to the main heart
+        center_zone = pygame.Rect(WIDTH//2 - 180, HEIGHT//2 - 180, 360, 360)  # Larger exclusion zone
+        attempts = 0
+        while True:
+            self.x = random.randint(0, WIDTH)
+            self.y = HEIGHT + random.randint(0, 100)
+            if not center_zone.collidepoint(self.x, self.y) or attempts > 20:
+                break
+            attempts += 1
+
+        self.size = random.uniform(0.3, 0.5)
+        self.speed = random.uniform(0.3, 0.7)  # Slower floating
+        self.blink_timer = random.randint(20, 50)  # Slower blink
+        self.visible = random.choice([True, False])
+
+    def update(self):
+        self.y -= self.speed
+        self.blink_timer -= 1
+        if self.blink_timer <= 0:
+            self.visible = not self.visible
+            self.blink_timer = random.randint(20, 50)
+        if self.y < -50:
+            self.reset()
+
+    def sprite(self):
+        # Glow and heart come from one cached sprite per quantized size
+        size = atlas.quantize_size(self.size)
+        return atlas.get(("small_heart", size), lambda: self.render_sprite(size))
+
+    def draw(self, surface, alpha=0.0):
+        rect = None
+        if self.visible:
+            # The sprite is added like the glow was; over the black background
+            # the pink heart saturates to the same colours as before.
+            sprite, (ox, oy) = self.sprite()
+            rect = surface.blit(sprite, (self.x + ox, self.y - self.speed * alpha + oy),
+                                special_flags=pygame.BLEND_RGBA_ADD)
+        return track(self, rect)
+
+    # Clickable: placed in the scene's grid and popped when clicked
+    def place(self, grid):
+        sprite, (ox, oy) = self.sprite()
+        grid.place((self, None), sprite.get_rect(topleft=(self.x + ox, self.y + oy)))
+
+    def hit(self, index, pos):
+        sprite, (ox, oy) = self.sprite()
+        return self.visible and sprite_hit(sprite, self.x + ox, self.y + oy, pos)
+
+    def pop(self, index):
+        self.reset()
+
+    @staticmethod
+    def render_sprite(size):
+        glow_radius = int(size * 30)
+        points = heart_points(0, 0, size * 5)
+        left = int(min(min(px for px, _ in points), -glow_radius)) - 2
+        top = int(min(min(py for _, py in points), -glow_radius)) - 2
+        right = int(max(max(px for px, _ in points), glow_radius)) + 3
+        bottom = int(max(max(py for _, py in points), glow_radius)) + 3
+        sprite = pygame.Surface((right - left, bottom - top), pygame.SRCALPHA)
+        # Glow
+        pygame.draw.circle(sprite, (255, 0, 0, 60), (-left, -top), glow_radius)
+        # Heart with pink border, smaller size
+        draw_heart(sprite, -left, -top, size * 5, PINK, border=True)
+        return sprite, (left, top)
+
+# Main center heart with animated scale
+class CenterHeart:
+    OUTLINE_SIZE = 7  # Larger heart (was 5)
+    OUTLINE_WIDTH = 4
+
+    def __init__(self, clock, keyframe_cache=64, scale_step=0.005):
+        self.scale = 0.0
+        self.max_scale = 1.0
+        self.growth_speed = 0.005  # Slower growth
+        self.visible = False
+        self.clock = clock
+        self.start_ticks = clock.ticks
+        self.draw_progress = 0  # Number of degrees drawn
+        self.drawing = True
+        self.filled = False
+        self.grown = False  # Growth finished (to within 0.1%); only the pulse is left
+        self.rect = None
+        self.prev_rect = None
+        # The outline is drawn incrementally onto a persistent layer
+        self.outline = None
+        self.outline_origin = None  # Screen position of the layer
+        self.outline_center = None  # Heart center within the layer
+        self.outline_drawn = 0  # Samples already on the layer
+        self.outline_rect = None  # Part of the layer drawn so far
+        # Filled heart + caption keyframes at quantized scales (scale_step is
+        # about half a pixel of heart width); keyframe_cache bounds memory
+        self.keyframes = SpriteAtlas(max_sprites=keyframe_cache, size_step=scale_step)
+        # The heart alone at the same scales, for clicks (the caption is
+        # wider than the heart while it grows)
+        self.shapes = SpriteAtlas(max_sprites=keyframe_cache, size_step=scale_step)
+
+    def update(self):
+        if self.drawing:
+            self.draw_progress += 1  # Slower outline drawing
+            if self.draw_progress >= 360:
+                self.draw_progress = 360
+                self.drawing = False
+                self.filled = True
+        elif self.scale < self.max_scale:
+            # Grow after outline is drawn
+            self.scale += self.growth_speed * (1 - self.scale / self.max_scale)
+            if self.max_scale - self.scale < 0.001 * self.max_scale:
+                self.grown = True
+        else:
+            # Pulse effect using sine wave after fully grown
+            self.grown = True
+            t = (self.clock.ticks - self.start_ticks) / 600.0  # Slower pulse
+            self.scale = self.max_scale + 0.05 * math.sin(t)
+        self.visible = self.draw_progress > 0 or self.scale > 0
+
+    @property
+    def settled(self):
+        return self.grown
+
+    frozen = False  # Pulses forever
+
+    def draw(self, surface, alpha=0.0):
+        rect = None
+        if self.visible:
+            if self.drawing:
+                rect = self.draw_outline(surface)
+            else:
+                self.outline = None  # Outline finished; free the layer
+                # Fill and pulse, one blit of the keyframe for this scale
+                sprite, (ox, oy) = self.keyframe()
+                rect = surface.blit(sprite, (WIDTH // 2 + ox, HEIGHT // 2 + oy))
+        return track(self, rect)
+
+    def keyframe(self):
+        scale = self.keyframes.quantize_size(self.scale)
+        return self.keyframes.get(scale, lambda: self.render_keyframe(scale))
+
+    def shape(self):
+        scale = self.keyframes.quantize_size(self.scale)
+        return self.shapes.get(scale, lambda: self.render_shape(scale))
+
+    # Clickable once filled, with the exact shape of the heart at the
+    # current keyframe's scale
+    def place(self, grid):
+        rect = None
+        if self.visible and not self.drawing:
+            sprite, (ox, oy) = self.shape()
+            rect = sprite.get_rect(topleft=(WIDTH // 2 + ox, HEIGHT // 2 + oy))
+        grid.place((self, None), rect)
+
+    def hit(self, index, pos):
+        if not self.visible or self.drawing:
+            return False
+        sprite, (ox, oy) = self.shape()
+        return sprite_hit(sprite, WIDTH // 2 + ox, HEIGHT // 2 + oy, pos)
+
+    @staticmethod
+    def render_shape(scale):
+        # Filled heart without the caption, anchored on the center
+        points = heart_points(0, 0, 7 * scale)
+        left = int(min(px for px, _ in points)) - 1
+        top = int(min(py for _, py in points)) - 1
+        right = int(max(px for px, _ in points)) + 2
+        bottom = int(max(py for _, py in points)) + 2
+        frame = pygame.Surface((right - left, bottom - top), pygame.SRCALPHA)
+        draw_heart(frame, -left, -top, 7 * scale, RED)
+        return frame, (left, top)
+
+    def draw_outline(self, surface):
+        # Add only the segments drawn since last frame (one sample per degree)
+        if self.outline is None:
+            shape = heart_points(0, 0, self.OUTLINE_SIZE)
+            pad = self.OUTLINE_WIDTH
+            left = int(min(px for px, _ in shape)) - pad
+            top = int(min(py for _, py in shape)) - pad
+            width = int(max(px for px, _ in shape)) + pad - left
+            height = int(max(py for _, py in shape)) + pad - top
+            self.outline = pygame.Surface((width, height), pygame.SRCALPHA)
+            self.outline_origin = (WIDTH // 2 + left, HEIGHT // 2 + top)
+            self.outline_center = (-left, -top)
+        if self.draw_progress > self.outline_drawn:
+            cx, cy = self.outline_center
+            points = heart_points(cx, cy, self.OUTLINE_SIZE, count=self.draw_progress,
+                                  start=max(0, self.outline_drawn - 1))
+            if len(points) > 1:
+                drawn = pygame.draw.lines(self.outline, RED, False, points, self.OUTLINE_WIDTH)
+                self.outline_rect = drawn if self.outline_rect is None else self.outline_rect.union(drawn)
+            self.outline_drawn = self.draw_progress
+        if self.outline_rect is None:
+            return None
+        ox, oy = self.outline_origin
+        return surface.blit(self.outline, self.outline_rect.move(ox, oy), area=self.outline_rect)
+
+    def render_keyframe(self, scale):
+        # Filled heart with 'Love for you' in the center, anchored on the center
+        points = heart_points(0, 0, 7 * scale)  # Larger heart
+        love_font = fonts.get("Arial", 32, bold=True)
+        love_text = render_text(love_font, "Love for you", WHITE)
+        tw, th = love_text.get_size()
+        left = min(int(min(px for px, _ in points)) - 1, -(tw // 2))
+        top = min(int(min(py for _, py in points)) - 1, -(th // 2))
+        right = max(int(max(px for px, _ in points)) + 2, tw - tw // 2)
+        bottom = max(int(max(py for _, py in points)) + 2, th - th // 2)
+        frame = pygame.Surface((right - left, bottom - top), pygame.SRCALPHA)
+        draw_heart(frame, -left, -top, 7 * scale, RED)
+        # Draw 'Love for you' in the center
+        frame.blit(love_text, (-left - tw // 2, -top - th // 2))
+        return frame, (left, top)
+
+# Animated text fade-in
+class FadingText:
+    WAVE_STEPS = 48  # Wave phases per period in the offset table (and strips once done)
+
+    def __init__(self, text, x, y, font, clock, duration=120, char_fade=20):  # Slower fade
+        self.text = text
+        self.clock = clock
+        self.x = x
+        self.y = y
+        self.duration = duration
+        self.char_fade = char_fade  # frames per character fade
+        self.frame = 0
+        self.chars_shown = 0
+        self.chars_revealed = 0  # Leading characters already at full alpha
+        self.char_alphas = [0] * len(text)
+        self.done = False
+        self.rect = None
+        self.prev_rect = None
+        # Use the same font as the layout for emoji support. Each glyph gets
+        # its own surface so its alpha can be changed in place.
+        self.surfaces = [render_text(font, c, WHITE).convert_alpha() for c in text]
+        self.drawn_alphas = [None] * len(text)
+        self.offsets = []
+        x_offset = 0
+        for surf in self.surfaces:
+            self.offsets.append(x_offset)
+            x_offset += surf.get_width()
+        self.width = x_offset
+        self.height = max((surf.get_height() for surf in self.surfaces), default=0)
+        # Wave effect: wave_table[phase][i] is char i's vertical offset
+        self.wave_table = [
+            [int(8 * math.sin(2 * math.pi * phase / self.WAVE_STEPS + i * 0.5)) for i in range(len(text))]
+            for phase in range(self.WAVE_STEPS)
+        ]
+        self.strips = {}  # phase -> pre-composited text, filled once fading is done
+
+    def update(self):
+        if not self.done:
+            self.frame += 1
+            # Reveal next character every char_fade frames
+            if self.chars_shown < len(self.text) and self.frame // self.char_fade > self.chars_shown:
+                self.chars_shown += 1
+            # Fade in each shown character; they reach full alpha in order,
+            # so only the ones after the revealed prefix need work
+            step = int(255 / self.char_fade)
+            for i in range(self.chars_revealed, self.chars_shown):
+                self.char_alphas[i] = min(255, self.char_alphas[i] + step)
+            while self.chars_revealed < self.chars_shown and self.char_alphas[self.chars_revealed] >= 255:
+                self.chars_revealed += 1
+            if self.chars_revealed == len(self.text):
+                self.done = True
+
+    @property
+    def settled(self):
+        # Only the slow wave is left once every character is shown
+        return self.done
+
+    frozen = False  # The wave never stops
+
+    def wave_phase(self):
+        t = self.clock.ticks / 400.0  # Animation time
+        return int(t / (2 * math.pi) * self.WAVE_STEPS) % self.WAVE_STEPS
+
+    def draw(self, screen, alpha=0.0):
+        phase = self.wave_phase()
+        if self.done:
+            # Frozen fast path: one blit of the strip for this wave phase
+            strip = self.strips.get(phase)
+            if strip is None:
+                strip = self.strips[phase] = self.render_strip(phase)
+            return track(self, screen.blit(strip, (self.x, self.y - 8)))
+        waves = self.wave_table[phase]
+        drawn = []
+        for i, surf in enumerate(self.surfaces):
+            if self.drawn_alphas[i] != self.char_alphas[i]:
+                surf.set_alpha(self.char_alphas[i])
+                self.drawn_alphas[i] = self.char_alphas[i]
+            drawn.append(screen.blit(surf, (self.x + self.offsets[i], self.y + waves[i])))
+        return track(self, drawn[0].unionall(drawn[1:]) if drawn else None)
+
+    def render_strip(self, phase):
+        # Whole banner at one wave phase; the strip starts 8 px above self.y
+        strip = pygame.Surface((max(self.width, 1), self.height + 17), pygame.SRCALPHA)
+        for i, surf in enumerate(self.surfaces):
+            surf.set_alpha(255)
+            # Glyph boxes do not overlap, so MAX copies them onto the clear strip unchanged
+            strip.blit(surf, (self.offsets[i], 8 + self.wave_table[phase][i]), special_flags=pygame.BLEND_RGBA_MAX)
+        self.drawn_alphas = [255] * len(self.text)
+        if pygame.display.get_surface() is not None:
+            strip = strip.convert_alpha()
+        return strip
+
+# Love letter animation class
+class LoveLetter:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.letter_y = y + 40
+        self.opening = True
+        self.open_progress = 0 # 0 to 1
+        self.slide_progress = 0 # 0 to 1
+        self.done = False
+        self.rect = None
+        self.prev_rect = None
+
+    def update(self):
+        if self.opening:
+            self.open_progress += 0.008 # Slower open
+            if self.open_progress >= 1:
+                self.open_progress = 1
+                self.opening = False
+        elif not self.done:
+            self.slide_progress += 0.008 # Slower slide
+            if self.slide_progress >= 1:
+                self.slide_progress = 1
+                self.done = True
+
+    @property
+    def settled(self):
+        return self.done
+
+    @property
+    def frozen(self):
+        # Open and fully slid out: the compositor keeps it in the background
+        return self.done
+
+    def sprite(self):
+        # Only whole-pixel flap/slide positions are visible, so frames are cached by them
+        flap_height = int(30 * (1 - self.open_progress))
+        letter_slide = int(40 * self.slide_progress)
+        return atlas.get(("love_letter", flap_height, letter_slide),
+                         lambda: self.render_frame(flap_height, letter_slide))
+
+    def draw(self, surface, alpha=0.0):
+        sprite, (ox, oy) = self.sprite()
+        return track(self, surface.blit(sprite, (self.x + ox, self.y + oy)))
+
+    # Clickable anywhere on the envelope or letter
+    def place(self, grid):
+        sprite, (ox, oy) = self.sprite()
+        grid.place((self, None), sprite.get_rect(topleft=(self.x + ox, self.y + oy)))
+
+    def hit(self, index, pos):
+        sprite, (ox, oy) = self.sprite()
+        return sprite_hit(sprite, self.x + ox, self.y + oy, pos)
+
+    @staticmethod
+    def render_frame(flap_height, letter_slide):
+        # The closed flap reaches 20 px above the letter's origin
+        frame = pygame.Surface((81, 111), pygame.SRCALPHA)
+        x, y = 0, 20
+        # Envelope base
+        pygame.draw.rect(frame, (255, 230, 200), (x, y + 40, 80, 50), border_radius=8)
+        # Envelope flap (animated open)
+        pygame.draw.polygon(frame, (255, 200, 200), [
+            (x, y + 40),
+            (x + 40, y + 10 - flap_height),
+            (x + 80, y + 40)
+        ])
+        # Letter (slides out)
+        pygame.draw.rect(frame, WHITE, (x + 10, y + 45 - letter_slide, 60, 40), border_radius=4)
+        # Heart seal on letter
+        pygame.draw.circle(frame, PINK, (x + 40, y + 65 - letter_slide), 7)
+        # Optional: add a small heart on the envelope
+        pygame.draw.polygon(frame, RED, [
+            (x + 40, y + 60),
+            (x + 35, y + 55),
+            (x + 30, y + 60),
+            (x + 40, y + 75),
+            (x + 50, y + 60),
+            (x + 45, y + 55)
+        ])
+        return frame, (-x, -y)
+
+# Rose stem and leaves, drawn under the rotating flower
+class RoseStem:
+    settled = True
+    frozen = True
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.rect = None
+        self.prev_rect = None
+
+    def update(self):
+        pass
+
+    def draw(self, surface, alpha=0.0):
+        return track(self, atlas.blit(surface, ("rose_stem",), self.render_frame, self.x, self.y))
+
+    @staticmethod
+    def render_frame():
+        # Same frame and anchor as the flower
+        frame = pygame.Surface((84, 106), pygame.SRCALPHA)
+        cx, cy = 42, 42
+        # Stem
+        pygame.draw.line(frame, (34, 139, 34), (cx, cy+20), (cx, cy+60), 6)  # ForestGreen
+        # Leaves
+        pygame.draw.ellipse(frame, (46, 139, 87), (cx-18, cy+40, 20, 12))  # SeaGreen
+        pygame.draw.ellipse(frame, (46, 139, 87), (cx-2, cy+50, 20, 12))
+        return frame, (-cx, -cy)
+
+# Animated rose (vector art)
+class AnimatedRose:
+    settled = True  # Slow ambient rotation
+    frozen = False
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.angle = 0
+        self.angle_speed = 0.5  # degrees per frame
+        self.rect = None
+        self.prev_rect = None
+
+    def update(self):
+        self.angle += self.angle_speed
+        if self.angle > 360:
+            self.angle -= 360
+
+    def draw(self, surface, alpha=0.0):
+        # The five petals repeat every 72 degrees, so one turn of frames covers the animation
+        angle = atlas.quantize_angle(self.angle, period=72)
+        rect = atlas.blit(surface, ("rose", angle), lambda: self.render_frame(angle), self.x, self.y)
+        return track(self, rect)
+
+    @staticmethod
+    def render_frame(angle):
+        # Flower only; the stem and leaves are RoseStem
+        frame = pygame.Surface((84, 84), pygame.SRCALPHA)
+        cx, cy = 42, 42
+        # Petals (animated rotation)
+        for i in range(5):
+            petal_angle = math.radians(angle + i * 72)
+            px = cx + 22 * math.cos(petal_angle)
+            py = cy + 22 * math.sin(petal_angle)
+            pygame.draw.ellipse(frame, (229, 57, 53), (px-12, py-16, 24, 32))  # Red petals
+        # Center
+        pygame.draw.circle(frame, (183, 28, 28), (cx, cy), 14)
+        return frame, (-cx, -cy)
+
+# Short note below the love letter
+class NoteText:
+    settled = True
+    frozen = True  # Never changes
+
+    def __init__(self, text, x, y, color):
+        self.text = text
+        self.x = x
+        self.y = y
+        self.color = color
+        self.rect = None
+        self.prev_rect = None
+
+    def draw(self, surface, alpha=0.0):
+        note_font = fonts.get("Arial", 18, bold=True)
+        note_text = render_text(note_font, self.text, self.color)
+        note_rect = note_text.get_rect()
+        note_rect.topleft = (self.x, self.y)
+        return track(self, surface.blit(note_text, note_rect))
+
+    def update(self):
+        pass
+
+
+# Font for the banner; prefer an emoji-capable font when one is installed
+def load_text_font():
+    font = fonts.get("Arial", 36, bold=True)
+    try:
+        emoji_font = fonts.get("Segoe UI Emoji", 36, bold=True)
+        test_surface = render_text(emoji_font, FROM_TEXT, WHITE)
+        if test_surface.get_width() > 0:
+            return emoji_font
+    except:
+        pass
+    return font
+
+# Whole scene: entities, their draw order and click targets
+class Scene:
+    def __init__(self, heart_count=10, use_particles=True):
+        self.clock = SimClock()
+        if use_particles and HeartParticles is not None:
+            # One struct-of-arrays entity for all floating hearts
+            center_zone = pygame.Rect(WIDTH//2 - 180, HEIGHT//2 - 180, 360, 360)
+            self.small_hearts = [HeartParticles(heart_count, WIDTH, HEIGHT, SmallHeart.render_sprite, center_zone)]
+        else:
+            self.small_hearts = [SmallHeart() for _ in range(heart_count)]
+        self.center_heart = CenterHeart(self.clock)
+        self.love_letter = LoveLetter(60, HEIGHT // 2 - 60)
+        self.animated_rose = AnimatedRose(WIDTH - 90, HEIGHT - 120)  # Bottom right corner
+        self.rose_stem = RoseStem(self.animated_rose.x, self.animated_rose.y)
+        # Add a short note below the love letter
+        self.note = NoteText("Click the love letter", self.love_letter.x, self.love_letter.y + 100, (255, 182, 193))  # Light pink
+        # Center the text horizontally and place at top
+        text_font = load_text_font()
+        text_surface = render_text(text_font, FROM_TEXT, WHITE)
+        text_x = WIDTH // 2 - text_surface.get_width() // 2
+        text_y = 40  # Top of the window
+        self.text = FadingText(FROM_TEXT, text_x, text_y, text_font, self.clock)
+        # Click targets, indexed by the cells they cover; brought up to date
+        # lazily, at most once per step, when something is picked
+        self.clickables = self.small_hearts + [self.love_letter, self.center_heart]
+        self.draw_order = {entity: i for i, entity in enumerate(self.entities)}
+        self.grid = SpatialGrid()
+        self.grid_stale = True
+
+    @property
+    def groups(self):
+        # (name, entities) in draw order; the benchmark times each group
+        return [
+            ("small_hearts", self.small_hearts),
+            ("love_letter", [self.love_letter]),
+            ("note", [self.note]),
+            ("center_heart", [self.center_heart]),
+            ("animated_rose", [self.rose_stem, self.animated_rose]),
+            ("text", [self.text]),
+        ]
+
+    @property
+    def entities(self):
+        return [entity for _, group in self.groups for entity in group]
+
+    @property
+    def settled(self):
+        # True once every one-shot animation has finished
+        return all(entity.settled for entity in self.entities)
+
+    def update(self, profiler=None):
+        # One fixed simulation step; with an enabled profiler each group is timed
+        self.clock.advance()
+        self.grid_stale = True
+        if profiler is None or not profiler.enabled:
+            for entity in self.entities:
+                entity.update()
+            return
+        for name, group in self.groups:
+            start = profiler.start()
+            for entity in group:
+                entity.update()
+            profiler.stop("update " + name, start, "entity")
+
+    def draw(self, surface, alpha=0.0, profiler=None, compositor=None):
+        # alpha: fraction of a step since the last update, for entities that
+        # draw their motion in between steps. With a compositor, frozen
+        # entities are already in its background and only live ones draw.
+        if compositor is not None:
+            draw = lambda entity: compositor.draw_layer(entity, surface, alpha)
+        else:
+            draw = lambda entity: entity.draw(surface, alpha)
+        if profiler is None or not profiler.enabled:
+            for entity in self.entities:
+                draw(entity)
+        else:
+            for name, group in self.groups:
+                start = profiler.start()
+                for entity in group:
+                    draw(entity)
+                profiler.stop("draw " + name, start, "entity")
+        if compositor is not None:
+            compositor.repair(surface, self.entities, alpha)
+
+    def pick(self, pos):
+        # Topmost clickable under pos as (entity, index), or None; index
+        # tells particles apart and is None for other entities
+        if self.grid_stale:
+            for entity in self.clickables:
+                entity.place(self.grid)
+            self.grid_stale = False
+        picked = None
+        for entity, index in self.grid.at(pos):
+            if picked is not None and self.draw_order[entity] < self.draw_order[picked[0]]:
+                continue
+            if entity.hit(index, pos):
+                picked = (entity, index)
+        return picked
+
+    def hit_test(self, pos):
+        # True when a click at pos should open the diary
+        picked = self.pick(pos)
+        return picked is not None and picked[0] in (self.center_heart, self.love_letter)
+
+    def click(self, pos):
+        # Pops a floating heart; True when the click should open the diary
+        picked = self.pick(pos)
+        if picked is None:
+            return False
+        entity, index = picked
+        if entity in (self.center_heart, self.love_letter):
+            return True
+        entity.pop(index)
+        self.grid_stale = True
+        return False
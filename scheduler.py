@@ -0,0 +1,83 @@
+import math
+import time
+
+import pygame
+
+# Fixed-step simulation scheduler.
+# Entity update() calls advance the animation by one step of 1/sim_rate
+# seconds, however often frames are rendered. Each frame the scheduler turns
+# the real time that passed into a number of steps, so a long frame (e.g. the
+# diary window pumping Tk) is caught up instead of slowing the whole scene.
+# When it falls behind it can skip rendering a few frames; when rendering
+# outpaces the simulation it reports how far into the next step the frame is
+# (alpha) so moving entities can be drawn in between.
+
+
+class FixedStepScheduler:
+    def __init__(self, sim_rate=60, render_fps=60, max_steps=8, max_frame_skip=4, interpolate=False):
+        self.sim_rate = sim_rate
+        self.render_fps = render_fps
+        self.step = 1.0 / sim_rate
+        self.max_steps = max_steps  # Past this the backlog is dropped, not simulated
+        self.max_frame_skip = max_frame_skip
+        self.interpolate = interpolate
+        self.clock = pygame.time.Clock()
+        self.accumulator = self.step  # The first frame runs one step
+        self.last_time = None
+        self.skipped = 0
+        self.alpha = 0.0
+        # Achieved rates, measured over one-second windows
+        self.sim_rate_achieved = 0.0
+        self.render_rate_achieved = 0.0
+        self._window_start = time.perf_counter()
+        self._window_steps = 0
+        self._window_renders = 0
+
+    def begin_frame(self):
+        # Number of update() steps to run this frame
+        now = time.perf_counter()
+        if self.last_time is not None:
+            self.accumulator += now - self.last_time
+        self.last_time = now
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = steps * self.step
+        self.accumulator -= steps * self.step
+        self.alpha = self.accumulator / self.step if self.interpolate else 0.0
+        self._window_steps += steps
+        return steps
+
+    def should_render(self, steps):
+        # Skip drawing while catching up (more steps than a frame normally
+        # needs), but never for more than max_frame_skip frames in a row
+        expected = max(1, math.ceil(self.sim_rate / self.render_fps))
+        if steps > expected and self.skipped < self.max_frame_skip:
+            self.skipped += 1
+            return False
+        self.skipped = 0
+        return True
+
+    def end_frame(self, rendered=True, idle=False):
+        # Frames skipped to catch up don't wait; idle frames (nothing to
+        # draw, e.g. a hidden window) still wait for the frame time
+        if rendered:
+            self._window_renders += 1
+        if rendered or idle:
+            self.clock.tick(self.render_fps)
+        now = time.perf_counter()
+        window = now - self._window_start
+        if window >= 1.0:
+            self.sim_rate_achieved = self._window_steps / window
+            self.render_rate_achieved = self._window_renders / window
+            self._window_start = now
+            self._window_steps = 0
+            self._window_renders = 0
+
+    def stats(self):
+        return {
+            "sim_rate": self.sim_rate,
+            "render_fps": self.render_fps,
+            "sim_rate_achieved": self.sim_rate_achieved,
+            "render_rate_achieved": self.render_rate_achieved,
+        }
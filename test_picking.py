@@ -0,0 +1,55 @@
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame  # noqa: E402  (after the SDL driver is chosen)
+import pytest  # noqa: E402
+from scene import WIDTH, HEIGHT, Scene  # noqa: E402
+
+# Click picking through Scene.hit_test / Scene.pick, on SDL's dummy driver
+
+CENTER = (WIDTH // 2, HEIGHT // 2)
+
+
+@pytest.fixture
+def scene():
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    random.seed(0)
+    yield Scene()
+    pygame.quit()
+
+
+def run_until_filled(scene):
+    while scene.center_heart.drawing:
+        scene.update()
+    scene.update()
+
+
+def test_center_heart_not_clickable_while_outlined(scene):
+    scene.update()
+    assert not scene.hit_test(CENTER)
+
+
+def test_click_on_filled_heart_hits(scene):
+    # Picked once early: the grid must follow the heart as the scene runs
+    scene.update()
+    scene.hit_test(CENTER)
+    run_until_filled(scene)
+    for _ in range(200):
+        scene.update()
+    assert scene.pick(CENTER) == (scene.center_heart, None)
+    assert scene.hit_test(CENTER)
+
+
+def test_caption_outside_heart_misses(scene):
+    # While the heart grows its caption is wider than it; only the heart counts
+    run_until_filled(scene)
+    scene.center_heart.scale = 0.2
+    scene.grid_stale = True
+    assert scene.hit_test(CENTER)
+    assert not scene.hit_test((WIDTH // 2 - 63, HEIGHT // 2 - 9))
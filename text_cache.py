@@ -0,0 +1,91 @@
+from collections import OrderedDict
+
+from font_cache import FontPathCache
+
+# Font registry and rendered-text cache.
+# SysFont goes through font discovery on every call, and rendering the same
+# caption every frame allocates a new surface, so both are cached here (font
+# files are also remembered across runs, see font_cache). Every pygame text
+# render in the scene goes through render_text().
+
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024  # Rendered text kept before evicting
+
+
+class FontRegistry:
+    def __init__(self, path_cache=None):
+        self._fonts = {}
+        self.hits = 0
+        self.misses = 0
+        # Resolved font files persisted across runs; created on first use
+        self.path_cache = path_cache
+
+    def get(self, name, size, bold=False, italic=False):
+        key = (name, size, bold, italic)
+        font = self._fonts.get(key)
+        if font is None:
+            self.misses += 1
+            if self.path_cache is None:
+                self.path_cache = FontPathCache()
+            font = self.path_cache.font(name, size, bold=bold, italic=italic)
+            self._fonts[key] = font
+        else:
+            self.hits += 1
+        return font
+
+    def clear(self):
+        self._fonts.clear()
+
+
+class TextCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, color, antialias=True):
+        # Cached surfaces are shared: callers must copy before modifying them
+        key = (font, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        self.bytes += self._size(surface)
+        while self.bytes > self.max_bytes and len(self._surfaces) > 1:
+            _, evicted = self._surfaces.popitem(last=False)
+            self.bytes -= self._size(evicted)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._surfaces),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    @staticmethod
+    def _size(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+# Shared instances used by the scene
+fonts = FontRegistry()
+text_cache = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    return text_cache.render(font, text, color, antialias)
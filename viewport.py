@@ -0,0 +1,277 @@
+import math
+import weakref
+
+import pygame
+
+# Render scale and window scaling.
+# The scene is laid out in logical WIDTH x HEIGHT pixels. With a render scale
+# below 1 it is drawn into a smaller frame through ScaledTarget, which scales
+# each sprite once and caches it, so every blit and fill covers fewer pixels.
+# The frame is then stretched to the window, either by SDL's renderer (the
+# SCALED display flag, usually on the GPU) or with pygame.transform.scale or
+# smoothscale into a window of any size, letterboxed to keep the aspect ratio.
+# Mouse positions are mapped back to logical pixels with to_logical().
+#
+# In auto mode the scale steps down while drawing and presenting take longer
+# than the frame budget, and back up once there is plenty of headroom.
+
+SCALERS = ("smooth", "fast", "sdl")
+
+
+def scale_rect(rect, scale):
+    # Smallest rect of frame pixels covering a logical rect
+    left, top = math.floor(rect.left * scale), math.floor(rect.top * scale)
+    right, bottom = math.ceil(rect.right * scale), math.ceil(rect.bottom * scale)
+    return pygame.Rect(left, top, right - left, bottom - top)
+
+
+def resize(source, size, smooth=True):
+    if smooth and source.get_bitsize() in (24, 32):
+        return pygame.transform.smoothscale(source, size)
+    return pygame.transform.scale(source, size)
+
+
+# Stands in for the frame surface while drawing; takes and returns logical
+# coordinates, like drawing on a full-size surface would
+class ScaledTarget:
+    def __init__(self, surface, logical_size, smooth=True):
+        self.smooth = smooth
+        self._sprites = weakref.WeakKeyDictionary()  # source surface -> scaled copy
+        self.set_surface(surface, logical_size)
+
+    def set_surface(self, surface, logical_size):
+        self.surface = surface
+        self.logical = pygame.Rect((0, 0), logical_size)
+        self.scale = surface.get_width() / logical_size[0]
+        self.clip = self.logical.copy()
+        self._sprites.clear()
+
+    def get_size(self):
+        return self.logical.size
+
+    def get_width(self):
+        return self.logical.width
+
+    def get_height(self):
+        return self.logical.height
+
+    def get_rect(self):
+        return self.logical.copy()
+
+    def get_clip(self):
+        return self.clip.copy()
+
+    def set_clip(self, rect=None):
+        self.clip = self.logical.clip(rect) if rect is not None else self.logical.copy()
+        self.surface.set_clip(scale_rect(self.clip, self.scale) if rect is not None else None)
+
+    def scaled(self, source):
+        if self.scale == 1:
+            return source
+        sprite = self._sprites.get(source)
+        if sprite is None:
+            width, height = source.get_size()
+            size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+            sprite = self._sprites[source] = resize(source, size, self.smooth)
+        # Per-surface alpha is changed in place by FadingText
+        alpha = source.get_alpha()
+        if sprite.get_alpha() != alpha:
+            sprite.set_alpha(alpha)
+        return sprite
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        # Positions are truncated like Surface.blit does, then floored when
+        # scaled, so a blit never reaches past scale_rect() of its rect
+        x, y = dest.topleft if isinstance(dest, pygame.Rect) else (int(dest[0]), int(dest[1]))
+        if area is None:
+            size = source.get_size()
+            sprite = self.scaled(source)
+        elif self.scale == 1:
+            area = pygame.Rect(area).clip(source.get_rect())
+            size = area.size
+            sprite = source.subsurface(area)
+        else:
+            area = pygame.Rect(area).clip(source.get_rect())
+            size = area.size
+            if not area:
+                return pygame.Rect((x, y), size).clip(self.logical)
+            # Exactly the frame pixels scale_rect() gives for the destination
+            covered = scale_rect(pygame.Rect((x, y), size), self.scale)
+            if source in self._sprites:
+                # Part of a surface already blitted whole (the compositor's
+                # background): cut from the cached copy
+                sprite = self.scaled(source)
+                cut = pygame.Rect(math.floor(area.x * self.scale), math.floor(area.y * self.scale), *covered.size)
+            else:
+                # Other area blits come from layers still being drawn (the
+                # heart outline), so they are scaled each time, not cached
+                sprite = resize(source.subsurface(area), covered.size, self.smooth)
+                cut = sprite.get_rect()
+            self.surface.blit(sprite, covered, area=cut, special_flags=special_flags)
+            return pygame.Rect((x, y), size).clip(self.logical)
+        self.surface.blit(sprite, (math.floor(x * self.scale), math.floor(y * self.scale)), special_flags=special_flags)
+        return pygame.Rect((x, y), size).clip(self.logical)
+
+    def blits(self, blit_sequence, doreturn=1):
+        # Particles send thousands of blits of a few sprites, so each sprite
+        # is looked up once per call
+        scale = self.scale
+        logical = self.logical
+        sprites = {}
+        scaled = []
+        rects = []
+        for source, dest, *rest in blit_sequence:
+            if rest and rest[0] is not None:
+                rects.append(self.blit(source, dest, *rest))
+                continue
+            x, y = dest.topleft if isinstance(dest, pygame.Rect) else (int(dest[0]), int(dest[1]))
+            sprite = sprites.get(source)
+            if sprite is None:
+                sprite = sprites[source] = (self.scaled(source), source.get_size())
+            scaled.append((sprite[0], (math.floor(x * scale), math.floor(y * scale)), None,
+                           rest[1] if len(rest) > 1 else 0))
+            if doreturn:
+                rects.append(logical.clip((x, y), sprite[1]))
+        self.surface.blits(scaled, doreturn=0)
+        return rects if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        if rect is None:
+            self.surface.fill(color, special_flags=special_flags)
+            return self.logical.copy()
+        rect = pygame.Rect(rect)
+        self.surface.fill(color, scale_rect(rect, self.scale), special_flags)
+        return rect.clip(self.logical)
+
+
+class Viewport:
+    def __init__(self, logical_size, window_size=None, render_scale=1.0, scaler="smooth", auto=False,
+                 min_scale=0.5, scale_step=0.1, patience=30):
+        if scaler not in SCALERS:
+            raise ValueError(f"unknown scaler {scaler!r}")
+        if auto and scaler == "sdl":
+            raise ValueError("auto render scale needs a software scaler (the sdl scaler resets the window)")
+        self.logical_size = logical_size
+        self.window_size = window_size or logical_size
+        self.render_scale = render_scale
+        self.scaler = scaler
+        self.auto = auto
+        self.min_scale = min_scale
+        self.scale_step = scale_step
+        self.patience = patience  # Frames over (or well under) budget before the scale changes
+        self.frame_ms = None  # Smoothed draw + present time
+        self.over_budget = 0
+        self.under_budget = 0
+        self.window = None
+        self.frame = None
+        self.target = None
+        self.fit = None  # Where the frame lands in the window
+        self.dest = None  # Window subsurface the frame is scaled into
+
+    @property
+    def direct(self):
+        # Nothing to scale: draw straight onto the window as before
+        return self.render_scale == 1 and self.window_size == self.logical_size and not self.auto
+
+    def render_size(self):
+        width, height = self.logical_size
+        return max(1, round(width * self.render_scale)), max(1, round(height * self.render_scale))
+
+    def open(self):
+        # Create the window; returns the surface the scene draws to
+        if self.direct:
+            self.window = self.frame = self.target = pygame.display.set_mode(self.logical_size)
+        elif self.scaler == "sdl":
+            self.window = self.frame = pygame.display.set_mode(self.render_size(), pygame.SCALED | pygame.RESIZABLE)
+            self.target = ScaledTarget(self.frame, self.logical_size)
+        else:
+            self.window = pygame.display.set_mode(self.window_size, pygame.RESIZABLE)
+            self.set_render_scale(self.render_scale)
+        return self.target
+
+    def set_render_scale(self, scale):
+        self.render_scale = scale
+        self.frame = pygame.Surface(self.render_size()).convert(self.window)
+        if self.target is None:
+            self.target = ScaledTarget(self.frame, self.logical_size, smooth=self.scaler != "fast")
+        else:
+            self.target.set_surface(self.frame, self.logical_size)
+        self.layout()
+
+    def layout(self):
+        # Largest rect with the scene's aspect ratio that fits the window, centered
+        window_w, window_h = self.window.get_size()
+        width, height = self.logical_size
+        factor = min(window_w / width, window_h / height)
+        self.fit = pygame.Rect(0, 0, max(1, round(width * factor)), max(1, round(height * factor)))
+        self.fit.center = (window_w // 2, window_h // 2)
+        self.dest = self.window.subsurface(self.fit) if self.fit.size != self.frame.get_size() else None
+        self.window.fill((0, 0, 0))
+
+    def handle_event(self, event):
+        # True when the window was resized and needs a full redraw
+        if event.type == pygame.VIDEORESIZE and not self.direct and self.scaler != "sdl":
+            self.window = pygame.display.get_surface()
+            self.layout()
+            return True
+        return False
+
+    def to_logical(self, pos):
+        x, y = pos
+        if self.direct:
+            return pos
+        if self.scaler == "sdl":
+            # SDL already maps the mouse onto the render size
+            return int(x / self.render_scale), int(y / self.render_scale)
+        width, height = self.logical_size
+        return int((x - self.fit.x) * width / self.fit.width), int((y - self.fit.y) * height / self.fit.height)
+
+    def flip(self):
+        if self.window is not self.frame:
+            self.blit_frame()
+        pygame.display.flip()
+
+    def update(self, rects):
+        # Dirty-rect present; rects are logical
+        if self.window is self.frame:
+            scale = self.render_scale if not self.direct else 1
+            pygame.display.update([scale_rect(rect, scale) for rect in rects])
+            return
+        # The whole frame is stretched anyway, but only the changed parts of
+        # the window are pushed
+        self.blit_frame()
+        width, height = self.logical_size
+        fx, fy = self.fit.width / width, self.fit.height / height
+        pygame.display.update([
+            pygame.Rect(self.fit.x + math.floor(rect.left * fx), self.fit.y + math.floor(rect.top * fy),
+                        math.ceil(rect.width * fx) + 1, math.ceil(rect.height * fy) + 1)
+            for rect in rects
+        ])
+
+    def blit_frame(self):
+        if self.dest is None:
+            self.window.blit(self.frame, self.fit)
+        elif self.scaler == "fast":
+            pygame.transform.scale(self.frame, self.fit.size, self.dest)
+        else:
+            pygame.transform.smoothscale(self.frame, self.fit.size, self.dest)
+
+    def adjust(self, frame_ms, budget_ms):
+        # Auto mode: called with the draw + present time of each rendered
+        # frame; True when the render scale changed
+        if not self.auto:
+            return False
+        self.frame_ms = frame_ms if self.frame_ms is None else self.frame_ms * 0.9 + frame_ms * 0.1
+        self.over_budget = self.over_budget + 1 if self.frame_ms > 0.9 * budget_ms else 0
+        self.under_budget = self.under_budget + 1 if self.frame_ms < 0.4 * budget_ms else 0
+        scale = self.render_scale
+        if self.over_budget >= self.patience and scale > self.min_scale:
+            scale = max(self.min_scale, round(scale - self.scale_step, 2))
+        elif self.under_budget >= 4 * self.patience and scale < 1:
+            scale = min(1.0, round(scale + self.scale_step, 2))
+        if scale == self.render_scale:
+            return False
+        self.set_render_scale(scale)
+        self.frame_ms = None
+        self.over_budget = self.under_budget = 0
+        return True